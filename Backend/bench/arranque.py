@@ -0,0 +1,84 @@
+"""Arranque en frío del servidor y presupuesto de conexiones por worker.
+
+Cada repetición corre en un proceso nuevo y mide por separado importar app.py,
+create_app() y la primera petición a /healthcheck (que abre la primera conexión
+del pool). Usa la base de DATABASE_URL y la configuración del entorno, igual
+que gunicorn.
+
+    python arranque.py --repeticiones 10
+    GUNICORN_WORKERS=8 DB_CONEXIONES_MAXIMAS=190 CACHE_URL=redis://localhost:6379/0 python arranque.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SERVIDOR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server')
+
+MEDIR = """
+import json, sys, time
+inicio = time.perf_counter()
+import app as modulo
+importado = time.perf_counter()
+aplicacion = modulo.create_app()
+creado = time.perf_counter()
+respuesta = aplicacion.test_client().get('/healthcheck')
+atendido = time.perf_counter()
+config = aplicacion.config
+tamano, overflow = modulo.presupuesto_conexiones(config)
+json.dump({
+    'importar': importado - inicio,
+    'create_app': creado - importado,
+    'primera_peticion': atendido - creado,
+    'estado': respuesta.status_code,
+    'workers': config['DB_WORKERS'],
+    'maximas': config['DB_CONEXIONES_MAXIMAS'],
+    'pgbouncer': config['DB_PGBOUNCER'],
+    'replicas': len(config['SQLALCHEMY_BINDS']),
+    'pool_size': tamano,
+    'max_overflow': overflow,
+}, sys.stdout)
+"""
+
+
+def medir():
+    salida = subprocess.run([sys.executable, '-c', MEDIR], cwd=SERVIDOR, capture_output=True, text=True)
+    if salida.returncode:
+        sys.exit(salida.stderr)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    medidas = [medir() for _ in range(args.repeticiones)]
+    if any(medida['estado'] != 200 for medida in medidas):
+        print('Aviso: /healthcheck no respondió 200; revise DATABASE_URL')
+    print(f'{"fase":<18}{"mediana ms":>12}{"máx ms":>10}')
+    for fase in ('importar', 'create_app', 'primera_peticion'):
+        tiempos = [medida[fase] * 1000 for medida in medidas]
+        print(f'{fase:<18}{statistics.median(tiempos):>12.1f}{max(tiempos):>10.1f}')
+    totales = [sum(medida[fase] for fase in ('importar', 'create_app', 'primera_peticion')) * 1000
+               for medida in medidas]
+    print(f'{"total":<18}{statistics.median(totales):>12.1f}{max(totales):>10.1f}')
+
+    medida = medidas[0]
+    if medida['pgbouncer']:
+        print('\nDB_PGBOUNCER=1: sin pool propio (NullPool); PgBouncer limita las conexiones a PostgreSQL')
+        return
+    # Cada worker: pool + overflow hacia la primaria y una conexión para el LISTEN de /stream
+    por_worker = medida['pool_size'] + medida['max_overflow'] + 1
+    print(f'\nworkers {medida["workers"]}, presupuesto DB_CONEXIONES_MAXIMAS {medida["maximas"]}')
+    print(f'por worker: pool_size {medida["pool_size"]} + max_overflow {medida["max_overflow"]} + 1 LISTEN'
+          f' = {por_worker}')
+    print(f'total hacia la primaria: {por_worker * medida["workers"]}'
+          + (f' (y hasta {(por_worker - 1) * medida["workers"]} en cada una de {medida["replicas"]} réplicas)'
+             if medida['replicas'] else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+"""Prueba de carga reproducible con la mezcla de peticiones de un día de clases.
+
+Cada usuario virtual inicia sesión como un alumno generado por generar_datos.py
+y repite, con pesos fijos, las operaciones más comunes del cliente móvil:
+consultar sus tareas, leer avisos, subir entregas y registrar solicitudes.
+Reporta peticiones por segundo, p50/p95/p99 y errores por operación. Con
+--guardar escribe una línea base en JSON y con --comparar sale con código 1 si
+alguna operación empeora más allá de --tolerancia. Solo usa la biblioteca
+estándar (importa rol_de de generar_datos.py, que no requiere psycopg2).
+
+--escenario contencion hace que todos los usuarios pidan --cantidad del mismo
+--reactivo: mide el descuento de stock cuando todas las escrituras compiten por
+una fila y, al terminar, compara el stock final con las solicitudes aceptadas.
+
+    python generar_datos.py --tamano pequeno --reiniciar
+    python carga.py --url http://localhost:5000 --ids 1-200 --usuarios 50 --duracion 60 --guardar lineas_base/pequeno.json
+    python carga.py --url http://localhost:5000 --ids 1-200 --usuarios 50 --duracion 60 --comparar lineas_base/pequeno.json
+    python carga.py --url http://localhost:5000 --ids 1-200 --usuarios 50 --duracion 30 --escenario contencion --reactivo 1
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from generar_datos import TAMANOS, TEMAS, rol_de
+
+# Peso relativo de cada operación en la mezcla
+MEZCLA = {
+    'tareas': 40,
+    'avisos': 25,
+    'solicitud': 15,
+    'entrega': 10,
+    'tarea': 8,
+    'login': 2,
+}
+ESCENARIOS = {
+    'mezcla': MEZCLA,
+    # Cada usuario solo inicia sesión al empezar y después solicita el mismo reactivo
+    'contencion': {'solicitud': 1, 'login': 0},
+}
+FRONTERA = 'sigelcarga'
+
+
+def percentil(valores, p):
+    if not valores:
+        return float('nan')
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def numero(texto):
+    """Entero si no lleva decimales, para que el JSON envíe 1 y no 1.0."""
+    return float(texto) if '.' in texto else int(texto)
+
+
+def rango(texto):
+    inicio, _, fin = texto.partition('-')
+    return range(int(inicio), int(fin or inicio) + 1)
+
+
+class UsuarioVirtual:
+    def __init__(self, args, azar, medir):
+        partes = urlsplit(args.url)
+        self.conexion = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=args.limite)
+        self.args = args
+        self.azar = azar
+        self.medir = medir
+        self.token = None
+        self.id_usuario = azar.choice([i for i in rango(args.ids) if rol_de(i) == 'alumno'])
+
+    def pedir(self, operacion, metodo, ruta, cuerpo=None, tipo='application/json'):
+        cabeceras = {'Content-Type': tipo} if cuerpo is not None else {}
+        if self.token:
+            cabeceras['Authorization'] = f'Bearer {self.token}'
+        inicio = time.perf_counter()
+        try:
+            self.conexion.request(metodo, ruta, body=cuerpo, headers=cabeceras)
+            respuesta = self.conexion.getresponse()
+            contenido = respuesta.read()
+            estado = respuesta.status
+        except (OSError, http.client.HTTPException):
+            self.conexion.close()
+            contenido, estado = b'', 0
+        self.medir(operacion, (time.perf_counter() - inicio) * 1000, estado)
+        return estado, contenido
+
+    def login(self):
+        cuerpo = json.dumps({'username': f'alumno{self.id_usuario}', 'hash_contraseña': self.args.contrasena})
+        self.token = None
+        estado, contenido = self.pedir('login', 'POST', '/login', cuerpo)
+        if estado == 200:
+            self.token = json.loads(contenido).get('token_acceso')
+
+    def tareas(self):
+        self.pedir('tareas', 'GET', f'/tareas/?user_id={self.id_usuario}&limit=20')
+
+    def tarea(self):
+        self.pedir('tarea', 'GET', f'/tareas/{self.azar.randint(1, self.args.tareas)}')
+
+    def avisos(self):
+        self.pedir('avisos', 'GET', '/avisos/?limit=20')
+
+    def solicitud(self):
+        id_reactivo = self.args.reactivo or self.azar.randint(1, self.args.reactivos)
+        cuerpo = json.dumps({'id_reactivo': id_reactivo, 'cantidad': self.args.cantidad,
+                             'proyecto': self.azar.choice(TEMAS), 'es_proyecto': False,
+                             'id_usuario': self.id_usuario})
+        self.pedir('solicitud', 'POST', '/solicitudes/', cuerpo)
+
+    def entrega(self):
+        cuerpo = (f'--{FRONTERA}\r\nContent-Disposition: form-data; name="id_tarea"\r\n\r\n'
+                  f'{self.azar.randint(1, self.args.tareas)}\r\n'
+                  f'--{FRONTERA}\r\nContent-Disposition: form-data; name="id_alumno"\r\n\r\n{self.id_usuario}\r\n'
+                  f'--{FRONTERA}\r\nContent-Disposition: form-data; name="file"; filename="carga.pdf"\r\n'
+                  'Content-Type: application/pdf\r\n\r\n').encode()
+        cuerpo += self.azar.randbytes(self.args.archivo) + f'\r\n--{FRONTERA}--\r\n'.encode()
+        self.pedir('entrega', 'POST', '/entregas/', cuerpo, f'multipart/form-data; boundary={FRONTERA}')
+
+    def ejecutar(self, fin):
+        self.login()
+        operaciones, pesos = zip(*ESCENARIOS[self.args.escenario].items())
+        while time.perf_counter() < fin:
+            getattr(self, self.azar.choices(operaciones, pesos)[0])()
+            if self.args.pausa:
+                time.sleep(self.azar.expovariate(1 / self.args.pausa))
+        self.conexion.close()
+
+
+def ejecutar(args):
+    mezcla = ESCENARIOS[args.escenario]
+    muestras = {operacion: [] for operacion in mezcla}
+    errores = {operacion: 0 for operacion in mezcla}
+    # Solicitudes creadas, incluido el calentamiento, para cuadrar el stock
+    creadas = [0]
+    candado = threading.Lock()
+    inicio_medicion = time.perf_counter() + args.calentamiento
+    fin = inicio_medicion + args.duracion
+
+    def medir(operacion, milisegundos, estado):
+        if operacion == 'solicitud' and estado == 201:
+            with candado:
+                creadas[0] += 1
+        # Lo registrado durante el calentamiento se descarta
+        if time.perf_counter() < inicio_medicion:
+            return
+        if 200 <= estado < 400:
+            muestras[operacion].append(milisegundos)
+        else:
+            errores[operacion] += 1
+
+    hilos = [threading.Thread(target=UsuarioVirtual(args, random.Random(args.semilla + i), medir).ejecutar,
+                              args=(fin,), daemon=True)
+             for i in range(args.usuarios)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    resultados = {}
+    for operacion in mezcla:
+        latencias = muestras[operacion]
+        total = len(latencias) + errores[operacion]
+        resultados[operacion] = {
+            'peticiones': total,
+            'errores': errores[operacion],
+            'por_segundo': round(total / args.duracion, 2),
+            'p50': round(percentil(latencias, 50), 2),
+            'p95': round(percentil(latencias, 95), 2),
+            'p99': round(percentil(latencias, 99), 2),
+        }
+    return resultados, creadas[0]
+
+
+def stock(args):
+    partes = urlsplit(args.url)
+    conexion = http.client.HTTPConnection(partes.hostname, partes.port or 80, timeout=args.limite)
+    try:
+        conexion.request('GET', f'/reactivos/{args.reactivo}')
+        return float(json.loads(conexion.getresponse().read())['cantidad'])
+    finally:
+        conexion.close()
+
+
+def imprimir(resultados):
+    print(f'{"operación":12} {"peticiones":>10} {"errores":>8} {"pet/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8}')
+    for operacion, r in resultados.items():
+        print(f'{operacion:12} {r["peticiones"]:>10} {r["errores"]:>8} {r["por_segundo"]:>8} '
+              f'{r["p50"]:>8} {r["p95"]:>8} {r["p99"]:>8}')
+
+
+def comparar(resultados, base, tolerancia):
+    """Devuelve las regresiones frente a la línea base: p95 o tasa de error peores que la tolerancia."""
+    regresiones = []
+    for operacion, anterior in base['resultados'].items():
+        actual = resultados.get(operacion)
+        if not actual or not anterior['peticiones']:
+            continue
+        if actual['p95'] > anterior['p95'] * (1 + tolerancia):
+            regresiones.append(f'{operacion}: p95 {anterior["p95"]} -> {actual["p95"]} ms')
+        tasa_anterior = anterior['errores'] / anterior['peticiones']
+        tasa_actual = actual['errores'] / actual['peticiones'] if actual['peticiones'] else 1
+        if tasa_actual > tasa_anterior + tolerancia / 10:
+            regresiones.append(f'{operacion}: errores {tasa_anterior:.1%} -> {tasa_actual:.1%}')
+    return regresiones
+
+
+if __name__ == '__main__':
+    pequeno = dict(zip(('usuarios', 'categorias', 'reactivos', 'solicitudes', 'tareas'), TAMANOS['pequeno']))
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--ids', default=f'1-{pequeno["usuarios"]}', help='Rango de id_usuario generados, p. ej. 1-2000')
+    parser.add_argument('--reactivos', type=int, default=pequeno['reactivos'], help='Mayor id_reactivo a solicitar')
+    parser.add_argument('--escenario', choices=sorted(ESCENARIOS), default='mezcla')
+    parser.add_argument('--reactivo', type=int, help='Solicitar siempre este id_reactivo (contencion usa 1 si falta)')
+    parser.add_argument('--cantidad', type=numero, default=0.01, help='Cantidad de cada solicitud')
+    parser.add_argument('--tareas', type=int, default=pequeno['tareas'], help='Mayor id de tarea a consultar o entregar')
+    parser.add_argument('--contrasena', default='sigel123')
+    parser.add_argument('--usuarios', type=int, default=20, help='Usuarios virtuales simultáneos')
+    parser.add_argument('--duracion', type=float, default=60, help='Segundos medidos')
+    parser.add_argument('--calentamiento', type=float, default=10, help='Segundos iniciales sin medir')
+    parser.add_argument('--pausa', type=float, default=0, help='Segundos medios entre peticiones de un usuario')
+    parser.add_argument('--archivo', type=int, default=64 * 1024, help='Bytes de cada archivo entregado')
+    parser.add_argument('--limite', type=float, default=30, help='Segundos máximos de espera por respuesta')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--guardar', help='Ruta del JSON donde guardar los resultados como línea base')
+    parser.add_argument('--comparar', help='Línea base JSON contra la cual comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.2, help='Empeoramiento relativo admitido del p95')
+    args = parser.parse_args()
+    if args.escenario == 'contencion':
+        args.reactivo = args.reactivo or 1
+        antes = stock(args)
+    resultados, creadas = ejecutar(args)
+    imprimir(resultados)
+    if args.escenario == 'contencion':
+        despues = stock(args)
+        esperado = round(antes - creadas * args.cantidad, 2)
+        print(f'stock del reactivo {args.reactivo}: {antes} -> {despues}; {creadas} solicitudes creadas, '
+              f'se esperaba {esperado} ({"cuadra" if round(despues, 2) == esperado else "NO CUADRA"})')
+    if args.guardar:
+        os.makedirs(os.path.dirname(os.path.abspath(args.guardar)), exist_ok=True)
+        with open(args.guardar, 'w', encoding='utf-8') as archivo:
+            parametros = {clave: valor for clave, valor in vars(args).items() if clave not in ('guardar', 'comparar')}
+            json.dump({'fecha': datetime.now().isoformat(timespec='seconds'), 'parametros': parametros,
+                       'resultados': resultados}, archivo, ensure_ascii=False, indent=2)
+        print(f'Línea base guardada en {args.guardar}')
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar(resultados, json.load(archivo), args.tolerancia)
+        for regresion in regresiones:
+            print(f'REGRESIÓN {regresion}')
+        if regresiones:
+            sys.exit(1)
+        print('Sin regresiones frente a la línea base')
@@ -0,0 +1,112 @@
+"""Benchmark de clientes lentos: cuántas subidas lentas simultáneas aguanta el
+servidor sin que las peticiones rápidas dejen de responder.
+
+Cada cliente lento envía una entrega multipart a /entregas/ goteando el cuerpo
+durante --duracion segundos (como un móvil con mala señal). Mientras tanto una
+sonda pide /categorias/ cada 200 ms y mide su latencia. Ejecutar contra el
+mismo servidor en modo sync y gevent, con un worker por núcleo:
+
+    GUNICORN_WORKER=sync   GUNICORN_WORKERS=1 gunicorn -c gunicorn.conf.py
+    GUNICORN_WORKER=gevent GUNICORN_WORKERS=1 gunicorn -c gunicorn.conf.py
+    python clientes_lentos.py --url http://localhost:5000 --clientes 200 --tarea 1 --alumno 3
+"""
+import argparse
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+FRONTERA = 'sigelbench'
+
+
+def percentil(valores, p):
+    if not valores:
+        return float('nan')
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def cuerpo_entrega(tarea, alumno, tamano):
+    partes = [
+        f'--{FRONTERA}\r\nContent-Disposition: form-data; name="id_tarea"\r\n\r\n{tarea}\r\n',
+        f'--{FRONTERA}\r\nContent-Disposition: form-data; name="id_alumno"\r\n\r\n{alumno}\r\n',
+        f'--{FRONTERA}\r\nContent-Disposition: form-data; name="file"; filename="bench.pdf"\r\n'
+        'Content-Type: application/pdf\r\n\r\n',
+    ]
+    return ''.join(partes).encode() + b'%' * tamano + f'\r\n--{FRONTERA}--\r\n'.encode()
+
+
+async def leer_estado(lector):
+    linea = await lector.readline()
+    return int(linea.split()[1]) if linea else 0
+
+
+async def cliente_lento(host, puerto, args, resultados):
+    cuerpo = cuerpo_entrega(args.tarea, args.alumno, args.tamano)
+    inicio = time.perf_counter()
+    try:
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        cabecera = (f'POST /entregas/ HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n'
+                    f'Content-Type: multipart/form-data; boundary={FRONTERA}\r\n'
+                    f'Content-Length: {len(cuerpo)}\r\n')
+        if args.token:
+            cabecera += f'Authorization: Bearer {args.token}\r\n'
+        escritor.write((cabecera + '\r\n').encode())
+        bloques = max(1, int(args.duracion / 0.1))
+        tamano_bloque = len(cuerpo) // bloques + 1
+        for i in range(0, len(cuerpo), tamano_bloque):
+            escritor.write(cuerpo[i:i + tamano_bloque])
+            await escritor.drain()
+            await asyncio.sleep(0.1)
+        estado = await asyncio.wait_for(leer_estado(lector), args.limite)
+        escritor.close()
+        resultados.append((estado, time.perf_counter() - inicio))
+    except (OSError, asyncio.TimeoutError):
+        resultados.append((0, time.perf_counter() - inicio))
+
+
+async def sonda(host, puerto, latencias, fallos, fin):
+    while time.perf_counter() < fin:
+        inicio = time.perf_counter()
+        try:
+            lector, escritor = await asyncio.open_connection(host, puerto)
+            escritor.write(f'GET /categorias/ HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n'.encode())
+            await escritor.drain()
+            estado = await asyncio.wait_for(leer_estado(lector), 5)
+            escritor.close()
+            if estado == 200:
+                latencias.append((time.perf_counter() - inicio) * 1000)
+            else:
+                fallos.append(estado)
+        except (OSError, asyncio.TimeoutError):
+            fallos.append(0)
+        await asyncio.sleep(0.2)
+
+
+async def main(args):
+    partes = urlsplit(args.url)
+    host, puerto = partes.hostname, partes.port or 80
+    resultados, latencias, fallos = [], [], []
+    inicio = time.perf_counter()
+    fin = inicio + args.duracion + 2
+    await asyncio.gather(sonda(host, puerto, latencias, fallos, fin),
+                         *[cliente_lento(host, puerto, args, resultados) for _ in range(args.clientes)])
+    total = time.perf_counter() - inicio
+    correctas = [duracion for estado, duracion in resultados if estado == 201]
+    print(f'Subidas lentas: {len(correctas)}/{args.clientes} correctas en {total:.1f} s '
+          f'(p50 {percentil(correctas, 50):.1f} s, p99 {percentil(correctas, 99):.1f} s)')
+    print(f'Sonda /categorias/: {len(latencias)} respuestas, {len(fallos)} fallos, '
+          f'p50 {percentil(latencias, 50):.1f} ms, p99 {percentil(latencias, 99):.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clientes', type=int, default=100)
+    parser.add_argument('--duracion', type=float, default=10, help='Segundos que tarda cada subida')
+    parser.add_argument('--tamano', type=int, default=4 * 1024 * 1024,
+                        help='Bytes del archivo subido; debe superar los búferes del socket para que el goteo se note')
+    parser.add_argument('--limite', type=float, default=60, help='Segundos máximos de espera por respuesta')
+    parser.add_argument('--tarea', type=int, required=True)
+    parser.add_argument('--alumno', type=int, required=True)
+    parser.add_argument('--token', help='Token de acceso si AUTH_OBLIGATORIA=1')
+    asyncio.run(main(parser.parse_args()))
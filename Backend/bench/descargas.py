@@ -0,0 +1,148 @@
+"""Benchmark de descargas simultáneas por worker: cuántas descargas lentas
+atiende cada proceso a la vez y cuánta memoria usa con ellas.
+
+Cada cliente pide /download/<recurso>/<id> y lee la respuesta a --velocidad
+bytes por segundo (como un móvil con mala señal), de modo que todas las
+descargas quedan abiertas al mismo tiempo. Se reporta el máximo de descargas
+en curso (cabeceras recibidas y cuerpo sin terminar), ese máximo dividido
+entre los workers y, con --pid del maestro de gunicorn, la memoria residente
+(VmRSS de /proc) de cada worker antes y en el pico de la prueba. Solo Linux
+para la memoria; solo usa la biblioteca estándar.
+
+    GUNICORN_WORKER=gevent GUNICORN_WORKERS=1 gunicorn -c gunicorn.conf.py --pid /tmp/sigel.pid
+    python descargas.py --url http://localhost:5000 --clientes 500 --recurso tarea --id 1 --pid $(cat /tmp/sigel.pid)
+"""
+import argparse
+import asyncio
+import os
+import time
+from urllib.parse import urlsplit
+
+
+def percentil(valores, p):
+    if not valores:
+        return float('nan')
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+def workers_de(pid):
+    """PIDs de los procesos hijos del maestro de gunicorn."""
+    hijos = []
+    for tarea in os.listdir(f'/proc/{pid}/task'):
+        with open(f'/proc/{pid}/task/{tarea}/children') as archivo:
+            hijos.extend(int(hijo) for hijo in archivo.read().split())
+    return hijos
+
+
+def memoria_kb(pid):
+    try:
+        with open(f'/proc/{pid}/status') as archivo:
+            for linea in archivo:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1])
+    except FileNotFoundError:
+        pass
+    return 0
+
+
+class Descargas:
+    def __init__(self):
+        self.en_curso = 0
+        self.maximo = 0
+        self.resultados = []
+
+    def empezar(self):
+        self.en_curso += 1
+        self.maximo = max(self.maximo, self.en_curso)
+
+    def terminar(self):
+        self.en_curso -= 1
+
+
+async def descargar(host, puerto, args, descargas):
+    inicio = time.perf_counter()
+    estado, recibidos, primer_byte, abierta = 0, 0, None, False
+    try:
+        lector, escritor = await asyncio.open_connection(host, puerto)
+        cabecera = (f'GET /download/{args.recurso}/{args.id} HTTP/1.1\r\nHost: {host}\r\n'
+                    'Connection: close\r\n')
+        if args.token:
+            cabecera += f'Authorization: Bearer {args.token}\r\n'
+        escritor.write((cabecera + '\r\n').encode())
+        await escritor.drain()
+        linea = await asyncio.wait_for(lector.readline(), args.limite)
+        estado = int(linea.split()[1]) if linea else 0
+        primer_byte = time.perf_counter() - inicio
+        while (await asyncio.wait_for(lector.readline(), args.limite)) not in (b'\r\n', b''):
+            pass
+        descargas.empezar()
+        abierta = True
+        # Lectura a ritmo fijo: bloques pequeños con pausas de 100 ms
+        bloque = max(1, int(args.velocidad / 10))
+        while True:
+            datos = await asyncio.wait_for(lector.read(bloque), args.limite)
+            if not datos:
+                break
+            recibidos += len(datos)
+            await asyncio.sleep(0.1)
+        escritor.close()
+    except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+        estado = 0
+    finally:
+        if abierta:
+            descargas.terminar()
+    descargas.resultados.append((estado, recibidos, primer_byte, time.perf_counter() - inicio))
+
+
+async def muestrear_memoria(pid, picos, clientes):
+    while not all(cliente.done() for cliente in clientes):
+        for worker in workers_de(pid):
+            picos[worker] = max(picos.get(worker, 0), memoria_kb(worker))
+        await asyncio.sleep(0.2)
+
+
+async def main(args):
+    partes = urlsplit(args.url)
+    host, puerto = partes.hostname, partes.port or 80
+    descargas = Descargas()
+    workers = workers_de(args.pid) if args.pid else []
+    antes = {worker: memoria_kb(worker) for worker in workers}
+    picos = dict(antes)
+    inicio = time.perf_counter()
+    clientes = [asyncio.create_task(descargar(host, puerto, args, descargas)) for _ in range(args.clientes)]
+    if args.pid:
+        await asyncio.gather(muestrear_memoria(args.pid, picos, clientes), *clientes)
+    else:
+        await asyncio.gather(*clientes)
+    total = time.perf_counter() - inicio
+
+    correctas = [r for r in descargas.resultados if r[0] == 200]
+    duraciones = [r[3] for r in correctas]
+    primeros = [r[2] * 1000 for r in correctas]
+    print(f'Descargas: {len(correctas)}/{args.clientes} con 200 en {total:.1f} s, '
+          f'{sum(r[1] for r in correctas) / 1024 / 1024:.1f} MB '
+          f'(duración p50 {percentil(duraciones, 50):.1f} s, p99 {percentil(duraciones, 99):.1f} s; '
+          f'primer byte p50 {percentil(primeros, 50):.0f} ms, p99 {percentil(primeros, 99):.0f} ms)')
+    cantidad = len(workers) or args.workers
+    print(f'Máximo de descargas en curso: {descargas.maximo} ({descargas.maximo / cantidad:.0f} por worker, '
+          f'{cantidad} workers)')
+    for worker in workers:
+        crecimiento = picos[worker] - antes[worker]
+        print(f'Worker {worker}: RSS {antes[worker] / 1024:.1f} MB antes, {picos[worker] / 1024:.1f} MB en el pico '
+              f'(+{crecimiento / 1024:.1f} MB, {crecimiento / max(1, descargas.maximo / cantidad):.0f} KB '
+              'por descarga en curso)')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clientes', type=int, default=200)
+    parser.add_argument('--recurso', choices=('tarea', 'entrega'), default='tarea')
+    parser.add_argument('--id', type=int, required=True, help='Id de la tarea o entrega con archivo')
+    parser.add_argument('--velocidad', type=int, default=64 * 1024, help='Bytes por segundo que lee cada cliente')
+    parser.add_argument('--limite', type=float, default=60, help='Segundos máximos de espera por lectura')
+    parser.add_argument('--pid', type=int, help='PID del maestro de gunicorn para medir la memoria de sus workers')
+    parser.add_argument('--workers', type=int, default=1, help='Workers del servidor si no se indica --pid')
+    parser.add_argument('--token', help='Token de acceso si AUTH_OBLIGATORIA=1')
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,96 @@
+"""Benchmark de difusión de /stream con miles de clientes SSE inactivos.
+
+Abre N conexiones a /stream, publica avisos con POST /avisos/ y mide cuánto
+tarda cada evento en llegar a todos los clientes. Solo usa la biblioteca
+estándar. Requiere un servidor capaz de mantener conexiones inactivas sin
+ocupar un worker por cliente (gevent) y un límite de descriptores suficiente
+(ulimit -n).
+
+    python difusion_sse.py --url http://localhost:5000 --clientes 2000 --eventos 20 --token <token docente>
+"""
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+
+def percentil(valores, p):
+    if not valores:
+        return float('nan')
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p / 100))]
+
+
+async def cliente(host, puerto, ruta, conectados, llegadas):
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    escritor.write(f'GET {ruta} HTTP/1.1\r\nHost: {host}\r\nAccept: text/event-stream\r\n\r\n'.encode())
+    await escritor.drain()
+    while (await lector.readline()) not in (b'\r\n', b''):
+        pass  # cabeceras
+    conectados.append(time.perf_counter())
+    try:
+        while True:
+            linea = await lector.readline()
+            if not linea:
+                break
+            if linea.startswith(b'data: '):
+                evento = json.loads(linea[6:])
+                llegadas.setdefault(evento['id'], []).append(time.perf_counter())
+    finally:
+        escritor.close()
+
+
+def publicar(url, token, numero):
+    cuerpo = json.dumps({'titulo': f'Benchmark {numero}', 'texto': 'Evento de prueba'}).encode()
+    peticion = urllib.request.Request(f'{url}/avisos/', data=cuerpo, method='POST', headers={
+        'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'})
+    with urllib.request.urlopen(peticion) as respuesta:
+        return json.load(respuesta)['id_aviso']
+
+
+async def main(args):
+    partes = urlsplit(args.url)
+    ruta = f'/stream?recursos=avisos&token={args.token}'
+    conectados, llegadas, enviados = [], {}, {}
+    inicio = time.perf_counter()
+    tareas = []
+    for i in range(args.clientes):
+        tareas.append(asyncio.create_task(cliente(partes.hostname, partes.port or 80, ruta, conectados, llegadas)))
+        if i % 200 == 199:
+            await asyncio.sleep(0.05)  # no saturar el backlog de accept
+    while len(conectados) < args.clientes:
+        fallidas = [t for t in tareas if t.done() and t.exception()]
+        if fallidas:
+            raise fallidas[0].exception()
+        await asyncio.sleep(0.1)
+    print(f'{args.clientes} clientes conectados en {time.perf_counter() - inicio:.2f} s')
+
+    bucle = asyncio.get_running_loop()
+    for numero in range(args.eventos):
+        enviado = time.perf_counter()
+        id_aviso = await bucle.run_in_executor(None, publicar, args.url, args.token, numero)
+        enviados[id_aviso] = enviado
+        await asyncio.sleep(args.intervalo)
+    await asyncio.sleep(args.espera)
+
+    latencias = [(llegada - enviados[id_aviso]) * 1000
+                 for id_aviso, tiempos in llegadas.items() if id_aviso in enviados for llegada in tiempos]
+    esperados = args.clientes * args.eventos
+    print(f'Entregados: {len(latencias)}/{esperados}')
+    print(f'Latencia ms  p50 {percentil(latencias, 50):.1f}  p95 {percentil(latencias, 95):.1f}  '
+          f'p99 {percentil(latencias, 99):.1f}  max {max(latencias, default=float("nan")):.1f}')
+    for tarea in tareas:
+        tarea.cancel()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:5000')
+    parser.add_argument('--clientes', type=int, default=1000)
+    parser.add_argument('--eventos', type=int, default=10)
+    parser.add_argument('--intervalo', type=float, default=0.5, help='Segundos entre publicaciones')
+    parser.add_argument('--espera', type=float, default=3, help='Segundos de espera tras el último evento')
+    parser.add_argument('--token', required=True, help='Token de acceso de un docente o admin')
+    asyncio.run(main(parser.parse_args()))
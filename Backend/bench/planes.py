@@ -0,0 +1,237 @@
+"""Revisión de planes de ejecución de las consultas del API.
+
+Recorre todas las rutas GET de los recursos RESTX (más algunas variantes con
+filtros y POST /login) con el cliente de pruebas de Flask, captura cada SELECT
+que emite el ORM y lo vuelve a ejecutar con EXPLAIN (ANALYZE, BUFFERS) en una
+transacción que se descarta. Señala:
+
+- Seq Scan selectivos sobre tablas grandes: devuelven una fracción pequeña de
+  las filas, así que falta un índice (funcional si el filtro aplica lower() u
+  otra función, compuesto si combina varias columnas).
+- Índices poco selectivos: el recorrido por índice descarta con Filter muchas
+  más filas de las que devuelve; falta un índice compuesto.
+
+Con --guardar escribe una línea base y con --comparar sale con código 1 si un
+plan empeora (nuevo Seq Scan o más buffers de los tolerados). También sale con
+código 1 si encuentra problemas. Requiere las dependencias del servidor y una
+base con datos representativos (generar_datos.py) en la URI configurada en
+server/app.py.
+
+    python generar_datos.py --tamano mediano --reiniciar
+    python planes.py --guardar lineas_base/planes_mediano.json
+    python planes.py --comparar lineas_base/planes_mediano.json
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+from sqlalchemy import event, text  # noqa: E402
+
+from app import Usuario, create_app, db, emitir_tokens  # noqa: E402
+
+# Rutas que no son consultas típicas: streaming, archivos o volcados completos
+EXCLUIDAS = ('/stream', '/download', '/swagger', '/metrics', '/healthcheck', '/cache', '/static', '/exportar',
+             'entregas.zip')
+VARIANTES = [
+    '/tareas/?user_id={id_alumno}&limit=20',
+    '/entregas/?id_alumno={id_alumno}',
+    '/entregas/?id_tarea={id_tarea}',
+    '/solicitudes/?id_usuario={id_alumno}&limit=20',
+    '/avisos/?id_usuario={id_docente}&limit=20',
+    '/tareas/{id_tarea}/estadisticas?faltantes=true',
+    '/analitica/consumo?agrupar=categoria&periodo=mes',
+    '/buscar?q=acido+clorhidrico',
+    '/sync?since=0&limit=100',
+]
+# Valor de ejemplo para cada parámetro de ruta: registros con datos relacionados
+MUESTRAS = {
+    'id_alumno': 'SELECT id_alumno FROM entregas ORDER BY id LIMIT 1',
+    'id_usuario': 'SELECT id_alumno FROM entregas ORDER BY id LIMIT 1',
+    'id_docente': 'SELECT creado_por FROM tareas WHERE creado_por IS NOT NULL ORDER BY id LIMIT 1',
+    'id_tarea': 'SELECT id_tarea FROM entregas ORDER BY id LIMIT 1',
+    'id_entrega': 'SELECT MAX(id) FROM entregas',
+    'id_reactivo': 'SELECT MAX(id_reactivo) FROM reactivos',
+    'id_categoria': 'SELECT MAX(id_categoria) FROM categorias',
+    'id_aviso': 'SELECT MAX(id_aviso) FROM avisos',
+    'id_solicitud': 'SELECT MAX(id_solicitud) FROM solicitudes',
+    'username': 'SELECT username FROM usuarios WHERE id_usuario = (SELECT id_alumno FROM entregas ORDER BY id LIMIT 1)',
+}
+ESCANEOS = ('Seq Scan', 'Index Scan', 'Index Only Scan', 'Bitmap Heap Scan')
+
+def peticiones(app, muestras):
+    """(nombre, método, ruta, cuerpo) para cada ruta GET y cada variante."""
+    for regla in sorted(app.url_map.iter_rules(), key=lambda regla: regla.rule):
+        if 'GET' not in regla.methods or any(parte in regla.rule for parte in EXCLUIDAS):
+            continue
+        ruta = re.sub(r'<(?:\w+:)?(\w+)>', lambda m: str(muestras.get(m.group(1), 1)), regla.rule)
+        yield regla.rule, 'GET', ruta, None
+    for variante in VARIANTES:
+        yield variante, 'GET', variante.format(**muestras), None
+    # Contraseña incorrecta: se consulta el usuario sin actualizar su hash
+    yield '/login', 'POST', '/login', {'username': muestras['username'], 'hash_contraseña': '-'}
+
+
+def nodos(plan):
+    yield plan
+    for hijo in plan.get('Plans', ()):
+        yield from nodos(hijo)
+
+
+def sugerencia(tabla, filtro):
+    """Índice probable a partir de la condición Filter de un recorrido."""
+    funciones = re.findall(r'(lower|upper|date|f_unaccent)\(\(?(\w+)', filtro or '')
+    columnas = list(dict.fromkeys(re.findall(r'\(?(\w+)\)?(?:::\w+)? (?:=|<=|>=|<|>) ', filtro or '')))
+    if funciones:
+        funcion, columna = funciones[0]
+        return f'índice funcional: CREATE INDEX ON {tabla} ({funcion}({columna}))'
+    if len(columnas) > 1:
+        return f'índice compuesto: CREATE INDEX ON {tabla} ({", ".join(columnas)})'
+    if columnas:
+        return f'índice: CREATE INDEX ON {tabla} ({columnas[0]})'
+    return 'revisar el filtro'
+
+
+def analizar(plan, filas_por_tabla, args):
+    """Problemas y resumen comparable de un plan de EXPLAIN (FORMAT JSON)."""
+    problemas, recorridos = [], []
+    for nodo in nodos(plan['Plan']):
+        if nodo['Node Type'] not in ESCANEOS or 'Relation Name' not in nodo:
+            continue
+        tabla = nodo['Relation Name']
+        recorridos.append(f"{nodo['Node Type']} {tabla} {nodo.get('Index Name', '')}".strip())
+        total = filas_por_tabla.get(tabla, 0)
+        # Desde PostgreSQL 18 Actual Rows es el promedio por ciclo con decimales
+        devueltas = round(nodo.get('Actual Rows', 0) * nodo.get('Actual Loops', 1))
+        descartadas = nodo.get('Rows Removed by Filter', 0) * nodo.get('Actual Loops', 1)
+        if nodo['Node Type'] == 'Seq Scan':
+            if total >= args.filas_minimas and descartadas and devueltas <= total * args.selectividad:
+                problemas.append(f'Seq Scan en {tabla} devuelve {devueltas} de {total:.0f} filas '
+                                 f'(filtro {nodo.get("Filter")}); {sugerencia(tabla, nodo.get("Filter"))}')
+        elif descartadas >= args.filas_minimas and descartadas > 10 * max(devueltas, 1):
+            problemas.append(f'{nodo["Node Type"]} con {nodo.get("Index Name")} descarta {descartadas} filas para '
+                             f'devolver {devueltas} (filtro {nodo.get("Filter")}); {sugerencia(tabla, nodo.get("Filter"))}')
+    return problemas, {
+        'recorridos': recorridos,
+        'costo': plan['Plan']['Total Cost'],
+        'buffers': plan['Plan'].get('Shared Hit Blocks', 0) + plan['Plan'].get('Shared Read Blocks', 0),
+        'ms': plan['Execution Time'],
+    }
+
+
+def comparar(resultados, base, tolerancia):
+    regresiones = []
+    for clave, anterior in base['consultas'].items():
+        actual = resultados.get(clave)
+        if not actual:
+            continue
+        nuevos = sorted({r for r in actual['recorridos'] if r.startswith('Seq Scan')}
+                        - {r for r in anterior['recorridos'] if r.startswith('Seq Scan')})
+        if nuevos:
+            regresiones.append(f'{clave}: nuevo {", ".join(nuevos)}')
+        if actual['buffers'] > max(anterior['buffers'], 10) * (1 + tolerancia):
+            regresiones.append(f'{clave}: buffers {anterior["buffers"]} -> {actual["buffers"]}')
+    return regresiones
+
+
+def contar_filas(conexion):
+    """Filas estimadas de cada tabla (reltuples, al día tras ANALYZE)."""
+    return dict(conexion.execute(text(
+        "SELECT relname, reltuples FROM pg_class WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace")).all())
+
+
+def revisar(app, args):
+    """Ejecuta las peticiones y explica cada SELECT; devuelve (resultados, problemas) por consulta."""
+    capturadas = []
+    with app.app_context():
+        motor = db.engine
+        with motor.connect() as conexion:
+            muestras = {nombre: conexion.execute(text(sql)).scalar() for nombre, sql in MUESTRAS.items()}
+            filas_por_tabla = contar_filas(conexion)
+    if muestras['id_alumno'] is None:
+        sys.exit('La base no tiene entregas; cargue datos con generar_datos.py')
+    # Token de admin: estadísticas y analítica piden rol aunque AUTH_OBLIGATORIA esté desactivada
+    with app.app_context():
+        token = emitir_tokens(Usuario(id_usuario=muestras['id_docente'], rol='admin'))['token_acceso']
+
+    def capturar(conexion, cursor, sentencia, parametros, contexto, executemany):
+        if not executemany and sentencia.lstrip().upper().startswith(('SELECT', 'WITH')) \
+                and 'pg_notify' not in sentencia:
+            capturadas.append((sentencia, parametros))
+
+    cliente = app.test_client()
+    resultados, problemas = {}, {}
+    event.listen(motor, 'before_cursor_execute', capturar)
+    try:
+        for nombre, metodo, ruta, cuerpo in peticiones(app, muestras):
+            capturadas.clear()
+            respuesta = cliente.open(ruta, method=metodo, json=cuerpo, headers={'Authorization': f'Bearer {token}'})
+            # Sin permiso no se ejecutan las consultas y el plan quedaría sin revisar
+            if respuesta.status_code >= 500 or respuesta.status_code in (401, 403):
+                problemas.setdefault(nombre, []).append(f'{metodo} {ruta} respondió {respuesta.status_code}')
+            explicadas = list(capturadas)
+            conexion = motor.raw_connection()
+            try:
+                cursor = conexion.cursor()
+                for numero, (sentencia, parametros) in enumerate(explicadas, start=1):
+                    cursor.execute('EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ' + sentencia, parametros)
+                    plan = cursor.fetchone()[0][0]
+                    conexion.rollback()
+                    encontrados, resumen = analizar(plan, filas_por_tabla, args)
+                    clave = f'{metodo} {nombre} #{numero}'
+                    resultados[clave] = dict(resumen, sql=' '.join(sentencia.split())[:200])
+                    if encontrados:
+                        problemas[clave] = encontrados
+                    print(f'{clave:60} {resumen["ms"]:>9.2f} ms {resumen["buffers"]:>7} buf  '
+                          f'{", ".join(resumen["recorridos"])}')
+            finally:
+                conexion.close()
+    finally:
+        event.remove(motor, 'before_cursor_execute', capturar)
+    return resultados, problemas
+
+
+def main(args, app=None):
+    # Sin réplicas: los planes se miden en la primaria configurada en DATABASE_URL
+    app = app or create_app({'AUTH_OBLIGATORIA': False, 'DATABASE_REPLICAS': []})
+    resultados, problemas = revisar(app, args)
+    for clave, encontrados in problemas.items():
+        for problema in encontrados:
+            print(f'PROBLEMA {clave}: {problema}')
+    if args.guardar:
+        with app.app_context(), db.engine.connect() as conexion:
+            filas_por_tabla = contar_filas(conexion)
+        os.makedirs(os.path.dirname(os.path.abspath(args.guardar)), exist_ok=True)
+        with open(args.guardar, 'w', encoding='utf-8') as archivo:
+            json.dump({'fecha': datetime.now().isoformat(timespec='seconds'), 'filas': filas_por_tabla,
+                       'consultas': resultados}, archivo, ensure_ascii=False, indent=2)
+        print(f'Línea base guardada en {args.guardar}')
+    regresiones = []
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as archivo:
+            regresiones = comparar(resultados, json.load(archivo), args.tolerancia)
+        for regresion in regresiones:
+            print(f'REGRESIÓN {regresion}')
+    print(f'{len(resultados)} consultas, {len(problemas)} con problemas, {len(regresiones)} regresiones')
+    if problemas or regresiones:
+        sys.exit(1)
+
+
+def argumentos():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas-minimas', type=int, default=10000,
+                        help='Tamaño desde el que un Seq Scan selectivo se considera problema')
+    parser.add_argument('--selectividad', type=float, default=0.05,
+                        help='Fracción máxima de filas devueltas para exigir índice')
+    parser.add_argument('--guardar', help='Ruta del JSON donde guardar los planes como línea base')
+    parser.add_argument('--comparar', help='Línea base JSON contra la cual comparar')
+    parser.add_argument('--tolerancia', type=float, default=0.5, help='Aumento relativo admitido de buffers')
+    return parser
+
+
+if __name__ == '__main__':
+    main(argumentos().parse_args())
@@ -0,0 +1,113 @@
+"""Microbenchmark de serialización: marshal_list_with de RESTX contra los serializadores compilados.
+
+Arma en memoria registros de los modelos del servidor con sus relaciones (sin
+base de datos), comprueba que ambos caminos producen el mismo resultado y
+reporta filas por segundo de cada uno, solo la conversión a diccionarios y
+con la codificación JSON de la respuesta (json.dumps como RESTX, y orjson si
+está instalado).
+
+    python serializacion.py --filas 20000 --repeticiones 5
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as hora
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server'))
+
+import app as servidor  # noqa: E402
+
+
+def usuarios(n):
+    return [servidor.Usuario(id_usuario=i, username=f'alumno{i}', nombre='Ana', apellido='Pérez',
+                             email=f'alumno{i}@sigel.mx', rol='alumno') for i in range(1, n + 1)]
+
+
+def registros(recurso, filas):
+    """Registros con las relaciones que cargan los listados (carga_*)."""
+    alumnos = usuarios(200)
+    docente = servidor.Usuario(id_usuario=1000, username='docente', nombre='Luis', apellido='Gómez',
+                               email='docente@sigel.mx', rol='docente')
+    creado = datetime(2026, 3, 1, 9, 30, 15)
+    if recurso == 'entregas':
+        tareas = [servidor.Tarea(id=i, titulo=f'Práctica {i}', descripcion='Titulación ácido-base',
+                                 fecha_entrega=date(2026, 4, 1), hora_cierre=hora(23, 59), creado_por=1000,
+                                 fecha_creacion=creado, creador=docente) for i in range(1, 51)]
+        return [servidor.Entrega(id=i, id_tarea=tareas[i % 50].id, id_alumno=alumnos[i % 200].id_usuario,
+                                 archivo_ruta=f'uploads/entrega_{i}.pdf', fecha_entrega=creado,
+                                 calificacion=Decimal('9.50') if i % 3 else None, observaciones='Bien',
+                                 alumno=alumnos[i % 200], tarea=tareas[i % 50]) for i in range(filas)]
+    if recurso == 'solicitudes':
+        categoria = servidor.Categoria(id_categoria=1, nombre='Ácidos', descripcion='Corrosivos')
+        reactivos = [servidor.Reactivo(id_reactivo=i, nombre=f'Reactivo {i}', cantidad=Decimal('12.50'),
+                                       unidad='mL', minimo=Decimal('5.00'), ubicacion='Anaquel A',
+                                       id_categoria=1, creado_por=1000, fecha_creacion=creado,
+                                       categoria=categoria) for i in range(1, 101)]
+        return [servidor.Solicitud(id_solicitud=i, id_reactivo=reactivos[i % 100].id_reactivo,
+                                   cantidad=Decimal('1.25'), proyecto='Tesis', es_proyecto=bool(i % 2),
+                                   id_usuario=alumnos[i % 200].id_usuario, fecha_solicitud=creado,
+                                   reactivo=reactivos[i % 100], usuario=alumnos[i % 200]) for i in range(filas)]
+    if recurso == 'tareas':
+        return [servidor.Tarea(id=i, titulo=f'Práctica {i}', descripcion='Titulación ácido-base',
+                               fecha_entrega=date(2026, 4, 1), hora_cierre=hora(23, 59) if i % 2 else None,
+                               creado_por=1000, fecha_creacion=creado, creador=docente) for i in range(filas)]
+    return alumnos * (filas // len(alumnos) + 1)
+
+
+MODELOS = {
+    'entregas': servidor.entrega_model,
+    'solicitudes': servidor.solicitud_model,
+    'tareas': servidor.tarea_model,
+    'usuarios': servidor.usuario_model,
+}
+
+
+def medir(funcion, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=20000)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--recursos', default=','.join(MODELOS), help='Separados por coma')
+    args = parser.parse_args()
+
+    app = servidor.create_app({'UPLOAD_FOLDER': tempfile.mkdtemp(), 'DATABASE_REPLICAS': []})
+    print(f'{args.filas} filas, mejor de {args.repeticiones}')
+    print(f'{"recurso":<13}{"camino":<20}{"filas/s":>12}{"+ JSON filas/s":>16}')
+    with app.test_request_context('/'):
+        for recurso in args.recursos.split(','):
+            modelo = MODELOS[recurso]
+            filas = registros(recurso, args.filas)[:args.filas]
+            restx = servidor.api.marshal_list_with(modelo)(lambda: filas)
+            compilado = lambda: servidor.serializar(filas, modelo)  # noqa: E731
+            if json.dumps(restx()) != json.dumps(compilado()):
+                sys.exit(f'{recurso}: los serializadores compilados no coinciden con marshal')
+            # RESTX codifica con json.dumps; salida_json usa orjson si está instalado
+            caminos = [
+                ('marshal_list_with', restx, lambda: json.dumps(restx())),
+                ('compilado', compilado, lambda: json.dumps(compilado())),
+            ]
+            if servidor.orjson:
+                caminos.append(('compilado + orjson', compilado, lambda: servidor.salida_json(compilado(), 200)))
+            base = None
+            for nombre, convertir, responder in caminos:
+                por_segundo = args.filas / medir(convertir, args.repeticiones)
+                con_json = args.filas / medir(responder, args.repeticiones)
+                base = base or con_json
+                print(f'{recurso:<13}{nombre:<20}{por_segundo:>12,.0f}{con_json:>16,.0f}'
+                      + (f'  x{con_json / base:.1f}' if nombre != 'marshal_list_with' else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,23 @@
 -- =============================================
 
 -- Crear extensiones necesarias
-CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Búsqueda: unaccent() inmutable para índices y configuración de español sin acentos
+CREATE OR REPLACE FUNCTION f_unaccent(text)
+RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent', $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+END $$;
 
 -- =============================================
 -- TABLA: usuarios (Sistema principal)
@@ -84,6 +100,17 @@ CREATE TABLE IF NOT EXISTS entregas (
     observaciones TEXT
 );
 
+-- =============================================
+-- TABLA: avisos
+-- =============================================
+CREATE TABLE IF NOT EXISTS avisos (
+    id_aviso SERIAL PRIMARY KEY,
+    id_usuario INTEGER NOT NULL REFERENCES usuarios(id_usuario),
+    fecha_hora TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    titulo VARCHAR(255) NOT NULL DEFAULT 'Sin título',
+    texto TEXT NOT NULL
+);
+
 -- =============================================
 -- TABLA: codigos_recuperacion
 -- =============================================
@@ -95,10 +122,38 @@ CREATE TABLE IF NOT EXISTS codigos_recuperacion (
     usado BOOLEAN DEFAULT FALSE
 );
 
+-- =============================================
+-- TABLA: cambios (registro para sincronización incremental)
+-- =============================================
+CREATE TABLE IF NOT EXISTS cambios (
+    id BIGSERIAL PRIMARY KEY,
+    recurso VARCHAR(20) NOT NULL,
+    id_registro INTEGER NOT NULL,
+    operacion CHAR(1) NOT NULL CHECK (operacion IN ('U', 'D')),
+    fecha TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    -- Transacción que registró el cambio: GET /sync entrega solo las ya terminadas
+    txid BIGINT NOT NULL DEFAULT (pg_current_xact_id()::text::bigint)
+);
+
+-- =============================================
+-- TABLA: consumo_diario (acumulado para la analítica de consumo)
+-- =============================================
+CREATE TABLE IF NOT EXISTS consumo_diario (
+    dia DATE NOT NULL,
+    id_reactivo INTEGER NOT NULL REFERENCES reactivos(id_reactivo),
+    id_usuario INTEGER NOT NULL REFERENCES usuarios(id_usuario),
+    proyecto VARCHAR(255) NOT NULL,
+    es_proyecto BOOLEAN NOT NULL,
+    total NUMERIC(12,2) NOT NULL,
+    solicitudes INTEGER NOT NULL,
+    PRIMARY KEY (dia, id_reactivo, id_usuario, proyecto, es_proyecto)
+);
+
 -- =============================================
 -- TABLA: Usuarios (Sistema de reservas - diferente tabla)
 -- =============================================
-CREATE TABLE IF NOT EXISTS Usuarios (
+-- Entre comillas: sin ellas el nombre se convierte a usuarios y choca con la tabla anterior
+CREATE TABLE IF NOT EXISTS "Usuarios" (
     IdUser SERIAL PRIMARY KEY,
     Usuario VARCHAR(100) NOT NULL,
     Nombre VARCHAR(100) NOT NULL,
@@ -113,7 +168,7 @@ CREATE TABLE IF NOT EXISTS Usuarios (
 -- =============================================
 CREATE TABLE IF NOT EXISTS Reservaciones (
     IdReserva SERIAL PRIMARY KEY,
-    IdUser INTEGER REFERENCES Usuarios(IdUser),
+    IdUser INTEGER REFERENCES "Usuarios"(IdUser),
     Servicio VARCHAR(100) NOT NULL,
     Fecha DATE NOT NULL,
     Hora TIME NOT NULL,
@@ -128,17 +183,20 @@ CREATE TABLE IF NOT EXISTS Reservaciones (
 -- =============================================
 
 -- Índices para usuarios
-CREATE INDEX IF NOT EXISTS idx_usuarios_username ON usuarios(username);
+-- Login compara lower(username); la restricción UNIQUE ya indexa username tal cual
+CREATE INDEX IF NOT EXISTS idx_usuarios_username_lower ON usuarios(lower(username));
 CREATE INDEX IF NOT EXISTS idx_usuarios_email ON usuarios(email);
 CREATE INDEX IF NOT EXISTS idx_usuarios_rol ON usuarios(rol);
 
-CREATE INDEX IF NOT EXISTS idx_Usuarios_sistema_email ON Usuarios(Email);
-CREATE INDEX IF NOT EXISTS idx_Usuarios_sistema_usuario ON Usuarios(Usuario);
+CREATE INDEX IF NOT EXISTS idx_Usuarios_sistema_email ON "Usuarios"(Email);
+CREATE INDEX IF NOT EXISTS idx_Usuarios_sistema_usuario ON "Usuarios"(Usuario);
 
 -- Índices para reactivos
 CREATE INDEX IF NOT EXISTS idx_reactivos_categoria ON reactivos(id_categoria);
 CREATE INDEX IF NOT EXISTS idx_reactivos_creado_por ON reactivos(creado_por);
 CREATE INDEX IF NOT EXISTS idx_reactivos_ubicacion ON reactivos(ubicacion);
+-- Índice parcial para GET /reactivos/bajo-stock: solo contiene los reactivos en o bajo su mínimo
+CREATE INDEX IF NOT EXISTS idx_reactivos_bajo_stock ON reactivos(id_reactivo) WHERE cantidad <= minimo;
 
 -- Índices para solicitudes
 CREATE INDEX IF NOT EXISTS idx_solicitudes_reactivo ON solicitudes(id_reactivo);
@@ -152,9 +210,27 @@ CREATE INDEX IF NOT EXISTS idx_tareas_fecha_creacion ON tareas(fecha_creacion);
 
 -- Índices para entregas
 CREATE INDEX IF NOT EXISTS idx_entregas_tarea ON entregas(id_tarea);
-CREATE INDEX IF NOT EXISTS idx_entregas_alumno ON entregas(id_alumno);
+-- Entregas de un alumno agrupadas por tarea: también sirve para filtrar solo por id_alumno
+CREATE INDEX IF NOT EXISTS idx_entregas_alumno_tarea ON entregas(id_alumno, id_tarea, fecha_entrega);
 CREATE INDEX IF NOT EXISTS idx_entregas_fecha ON entregas(fecha_entrega);
 
+-- Índices de búsqueda (GET /buscar): texto completo y trigramas sin acentos
+CREATE INDEX IF NOT EXISTS idx_reactivos_busqueda ON reactivos
+    USING gin (to_tsvector('es_unaccent', nombre));
+CREATE INDEX IF NOT EXISTS idx_reactivos_nombre_trgm ON reactivos
+    USING gin (f_unaccent(lower(nombre)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_tareas_busqueda ON tareas
+    USING gin (to_tsvector('es_unaccent', titulo || ' ' || coalesce(descripcion, '')));
+CREATE INDEX IF NOT EXISTS idx_tareas_titulo_trgm ON tareas
+    USING gin (f_unaccent(lower(titulo)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_avisos_busqueda ON avisos
+    USING gin (to_tsvector('es_unaccent', titulo || ' ' || texto));
+CREATE INDEX IF NOT EXISTS idx_avisos_titulo_trgm ON avisos
+    USING gin (f_unaccent(lower(titulo)) gin_trgm_ops);
+
+-- Índice para GET /sync: cambios en orden de transacción
+CREATE INDEX IF NOT EXISTS idx_cambios_txid ON cambios(txid, id);
+
 -- Índices para códigos de recuperación
 CREATE INDEX IF NOT EXISTS idx_codigos_email ON codigos_recuperacion(email);
 CREATE INDEX IF NOT EXISTS idx_codigos_usado ON codigos_recuperacion(usado);
@@ -187,7 +263,7 @@ INSERT INTO usuarios (username, nombre, apellido, email, hash_contraseña, rol)
 ON CONFLICT (username) DO NOTHING;
 
 -- Insertar usuarios del sistema de reservas
-INSERT INTO Usuarios (Usuario, Nombre, Apellido, Email, Telefono, Password) VALUES
+INSERT INTO "Usuarios" (Usuario, Nombre, Apellido, Email, Telefono, Password) VALUES
 ('reserva.admin', 'Admin Reservas', 'Sistema', 'reservas@sigel.edu', '5551234567', 'reserva123'),
 ('juan.perez', 'Juan', 'Pérez', 'juan.perez@sigel.edu', '5557654321', 'user123')
 ON CONFLICT (Email) DO NOTHING;
@@ -215,6 +291,13 @@ INSERT INTO solicitudes (id_reactivo, cantidad, proyecto, es_proyecto, id_usuari
 (2, 0.1, 'Preparación de Soluciones', false, 4)
 ON CONFLICT (id_solicitud) DO NOTHING;
 
+-- Acumulado de consumo de las solicitudes de ejemplo
+INSERT INTO consumo_diario (dia, id_reactivo, id_usuario, proyecto, es_proyecto, total, solicitudes)
+SELECT fecha_solicitud::date, id_reactivo, id_usuario, proyecto, es_proyecto, SUM(cantidad), COUNT(*)
+FROM solicitudes
+GROUP BY fecha_solicitud::date, id_reactivo, id_usuario, proyecto, es_proyecto
+ON CONFLICT DO NOTHING;
+
 -- Insertar reservaciones de ejemplo
 INSERT INTO Reservaciones (IdUser, Servicio, Fecha, Hora, ParaOtraPersona, NombrePersona, Estado) VALUES
 (1, 'Uso de Espectrómetro', '2024-12-15', '10:00:00', false, NULL, 'confirmada'),
@@ -290,9 +373,12 @@ COMMENT ON TABLE reactivos IS 'Inventario de reactivos y materiales del laborato
 COMMENT ON TABLE solicitudes IS 'Solicitudes de reactivos por parte de usuarios';
 COMMENT ON TABLE tareas IS 'Tareas asignadas a estudiantes';
 COMMENT ON TABLE entregas IS 'Entregas de tareas por parte de estudiantes';
+COMMENT ON TABLE avisos IS 'Avisos publicados para los usuarios';
 COMMENT ON TABLE categorias IS 'Categorías para clasificar reactivos';
+COMMENT ON TABLE cambios IS 'Altas, modificaciones (U) y bajas (D) para GET /sync';
+COMMENT ON TABLE consumo_diario IS 'Consumo de reactivos por día, mantenido al registrar o eliminar solicitudes';
 COMMENT ON TABLE codigos_recuperacion IS 'Códigos para recuperación de contraseñas';
-COMMENT ON TABLE Usuarios IS 'Usuarios del sistema de reservas (tabla separada)';
+COMMENT ON TABLE "Usuarios" IS 'Usuarios del sistema de reservas (tabla separada)';
 COMMENT ON TABLE Reservaciones IS 'Reservaciones de equipos y servicios del laboratorio';
 
 COMMENT ON COLUMN usuarios.rol IS 'Roles: admin, docente, alumno';
@@ -306,7 +392,7 @@ COMMENT ON COLUMN Reservaciones.Estado IS 'Estados: pendiente, confirmada, cance
 DO $$ 
 BEGIN
     RAISE NOTICE 'Base de datos SIGEL inicializada correctamente';
-    RAISE NOTICE 'Tablas creadas: usuarios, categorias, reactivos, solicitudes, tareas, entregas, codigos_recuperacion, Usuarios, Reservaciones';
+    RAISE NOTICE 'Tablas creadas: usuarios, categorias, reactivos, solicitudes, tareas, entregas, avisos, codigos_recuperacion, Usuarios, Reservaciones';
     RAISE NOTICE 'Datos de ejemplo insertados';
     RAISE NOTICE 'Índices y vistas creados';
 END $$;
\ No newline at end of file
@@ -0,0 +1,12 @@
+-- =============================================
+-- Registro de cambios para GET /sync
+-- =============================================
+CREATE TABLE IF NOT EXISTS cambios (
+    id BIGSERIAL PRIMARY KEY,
+    recurso VARCHAR(20) NOT NULL,
+    id_registro INTEGER NOT NULL,
+    operacion CHAR(1) NOT NULL CHECK (operacion IN ('U', 'D')),
+    fecha TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE cambios IS 'Altas, modificaciones (U) y bajas (D) para GET /sync';
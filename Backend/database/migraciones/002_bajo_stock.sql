@@ -0,0 +1,6 @@
+-- =============================================
+-- Índice parcial para GET /reactivos/bajo-stock
+-- =============================================
+-- Solo indexa los reactivos con existencia igual o menor a su mínimo, así que
+-- la consulta cuesta lo mismo sin importar el tamaño del inventario.
+CREATE INDEX IF NOT EXISTS idx_reactivos_bajo_stock ON reactivos(id_reactivo) WHERE cantidad <= minimo;
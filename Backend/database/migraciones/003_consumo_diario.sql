@@ -0,0 +1,22 @@
+-- =============================================
+-- Acumulado diario de consumo para /analitica/consumo
+-- =============================================
+CREATE TABLE IF NOT EXISTS consumo_diario (
+    dia DATE NOT NULL,
+    id_reactivo INTEGER NOT NULL REFERENCES reactivos(id_reactivo),
+    id_usuario INTEGER NOT NULL REFERENCES usuarios(id_usuario),
+    proyecto VARCHAR(255) NOT NULL,
+    es_proyecto BOOLEAN NOT NULL,
+    total NUMERIC(12,2) NOT NULL,
+    solicitudes INTEGER NOT NULL,
+    PRIMARY KEY (dia, id_reactivo, id_usuario, proyecto, es_proyecto)
+);
+
+COMMENT ON TABLE consumo_diario IS 'Consumo de reactivos por día, mantenido al registrar o eliminar solicitudes';
+
+-- Carga inicial con el historial existente
+INSERT INTO consumo_diario (dia, id_reactivo, id_usuario, proyecto, es_proyecto, total, solicitudes)
+SELECT fecha_solicitud::date, id_reactivo, id_usuario, proyecto, es_proyecto, SUM(cantidad), COUNT(*)
+FROM solicitudes
+GROUP BY fecha_solicitud::date, id_reactivo, id_usuario, proyecto, es_proyecto
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,45 @@
+-- =============================================
+-- Búsqueda de texto completo y aproximada para GET /buscar
+-- =============================================
+CREATE EXTENSION IF NOT EXISTS unaccent;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- unaccent() es STABLE y no puede usarse en índices; este envoltorio fija el
+-- diccionario y se declara IMMUTABLE
+CREATE OR REPLACE FUNCTION f_unaccent(text)
+RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent', $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+-- Español sin acentos: "Ácido Clorhídrico" y "acido clorhidrico" generan los mismos lexemas
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_unaccent') THEN
+        CREATE TEXT SEARCH CONFIGURATION es_unaccent (COPY = spanish);
+        ALTER TEXT SEARCH CONFIGURATION es_unaccent
+            ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    END IF;
+END $$;
+
+-- La tabla avisos existía solo en el modelo de la API
+CREATE TABLE IF NOT EXISTS avisos (
+    id_aviso SERIAL PRIMARY KEY,
+    id_usuario INTEGER NOT NULL REFERENCES usuarios(id_usuario),
+    fecha_hora TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    titulo VARCHAR(255) NOT NULL DEFAULT 'Sin título',
+    texto TEXT NOT NULL
+);
+
+-- Índices de expresión: deben coincidir con las expresiones de app.py
+CREATE INDEX IF NOT EXISTS idx_reactivos_busqueda ON reactivos
+    USING gin (to_tsvector('es_unaccent', nombre));
+CREATE INDEX IF NOT EXISTS idx_reactivos_nombre_trgm ON reactivos
+    USING gin (f_unaccent(lower(nombre)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_tareas_busqueda ON tareas
+    USING gin (to_tsvector('es_unaccent', titulo || ' ' || coalesce(descripcion, '')));
+CREATE INDEX IF NOT EXISTS idx_tareas_titulo_trgm ON tareas
+    USING gin (f_unaccent(lower(titulo)) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_avisos_busqueda ON avisos
+    USING gin (to_tsvector('es_unaccent', titulo || ' ' || texto));
+CREATE INDEX IF NOT EXISTS idx_avisos_titulo_trgm ON avisos
+    USING gin (f_unaccent(lower(titulo)) gin_trgm_ops);
@@ -0,0 +1,20 @@
+-- =============================================
+-- Índices para las consultas frecuentes (bench/planes.py)
+-- =============================================
+-- CONCURRENTLY no bloquea las escrituras mientras se crean; psql -f ejecuta
+-- cada sentencia fuera de una transacción, como lo exige CONCURRENTLY.
+
+-- Login filtra por lower(username): el índice sobre username no sirve y cada
+-- inicio de sesión recorría toda la tabla. La restricción UNIQUE de username
+-- ya tiene su propio índice, así que idx_usuarios_username sobraba.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_usuarios_username_lower ON usuarios(lower(username));
+DROP INDEX CONCURRENTLY IF EXISTS idx_usuarios_username;
+
+-- Estado de tareas (GET /tareas/?user_id=), tableros y alumnos sin entrega
+-- buscan las entregas de un alumno por tarea y su primera fecha: con las tres
+-- columnas se responde solo con el índice. Reemplaza a idx_entregas_alumno.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_entregas_alumno_tarea ON entregas(id_alumno, id_tarea, fecha_entrega);
+DROP INDEX CONCURRENTLY IF EXISTS idx_entregas_alumno;
+
+ANALYZE usuarios;
+ANALYZE entregas;
@@ -0,0 +1,13 @@
+-- =============================================
+-- Orden de confirmación para GET /sync
+-- =============================================
+-- El token de /sync era el último id de cambios entregado, con un margen de
+-- 2 segundos sobre la fecha de inicio de la transacción. Una transacción que
+-- tardaba más en confirmar dejaba su cambio detrás del token y el cliente no
+-- lo recibía nunca. Ahora cada cambio guarda su transacción y /sync entrega
+-- solo los de transacciones anteriores al horizonte pg_snapshot_xmin, que ya
+-- terminaron todas. Las filas existentes toman la transacción de esta
+-- migración. Los tokens anteriores dejan de servir: el cliente vuelve a
+-- sincronizar con since=0.
+ALTER TABLE cambios ADD COLUMN IF NOT EXISTS txid BIGINT NOT NULL DEFAULT (pg_current_xact_id()::text::bigint);
+CREATE INDEX IF NOT EXISTS idx_cambios_txid ON cambios(txid, id);
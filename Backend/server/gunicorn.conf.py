@@ -0,0 +1,45 @@
+# Configuración de gunicorn: gunicorn -c gunicorn.conf.py
+#
+# GUNICORN_WORKER=gevent (por defecto) atiende en cada proceso miles de
+# conexiones lentas u ociosas (subidas desde el móvil, descargas, /stream): un
+# cliente que espera red no ocupa el worker. GUNICORN_WORKER=sync es el modo
+# anterior, un cliente a la vez por proceso.
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class = os.environ.get('GUNICORN_WORKER', 'gevent')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count()))
+# La aplicación reparte el pool y elige la caché según la cantidad real de
+# workers: con más de uno exige CACHE_URL (redis) en lugar de la caché en memoria
+os.environ['GUNICORN_WORKERS'] = str(workers)
+# Clientes simultáneos por worker gevent; las consultas siguen limitadas por el pool de SQLAlchemy
+worker_connections = int(os.environ.get('GUNICORN_CONEXIONES', 1000))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+wsgi_app = 'wsgi:app'
+# Con --preload el maestro importa la aplicación una vez y los workers la
+# heredan al hacer fork: arrancan antes y comparten memoria. GUNICORN_PRELOAD=0
+# vuelve a importarla en cada worker (necesario para recargar con HUP).
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+if preload_app and worker_class == 'gevent':
+    # Parchear antes de que el maestro importe la aplicación, para que sus
+    # candados e hilos ya sean los de gevent al heredarlos los workers
+    from gevent import monkey
+    monkey.patch_all()
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        # psycopg2 espera la red con el hub de gevent en lugar de bloquear el proceso
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    if preload_app:
+        # Las conexiones abiertas en el maestro no se comparten entre procesos:
+        # cada worker empieza con pools vacíos sin cerrar las del padre
+        from app import db
+        from wsgi import app
+        with app.app_context():
+            for motor in db.engines.values():
+                motor.dispose(close=False)
@@ -0,0 +1,63 @@
+"""Roles: las operaciones privilegiadas piden token aunque AUTH_OBLIGATORIA esté desactivada."""
+import io
+from datetime import date
+
+import pytest
+
+from app import Entrega, Tarea, create_app
+
+PRIVILEGIADAS = [
+    ('put', '/tareas/{tarea}/calificaciones', [{'id_entrega': 1, 'calificacion': 10}]),
+    ('get', '/tareas/{tarea}/estadisticas', None),
+    ('get', '/tareas/{tarea}/entregas.zip', None),
+    ('get', '/analitica/consumo', None),
+    ('post', '/analitica/consumo/reconstruir', None),
+    ('post', '/usuarios/', {'username': 'nuevo', 'nombre': 'N', 'apellido': 'A', 'email': 'n@sigel.test',
+                            'hash_contraseña': 'x', 'rol': 'admin'}),
+    ('delete', '/usuarios/{alumno}', None),
+    ('post', '/usuarios/lote', []),
+    ('get', '/usuarios/exportar', None),
+    ('post', '/reactivos/lote', []),
+    ('post', '/solicitudes/lote', []),
+    ('get', '/solicitudes/exportar', None),
+]
+
+
+@pytest.fixture
+def ids(datos):
+    docente = datos.usuario('docente')
+    alumno = datos.usuario('alumno')
+    tarea = datos.crear(Tarea, titulo='Práctica', fecha_entrega=date(2030, 1, 1), creado_por=docente)
+    datos.crear(Entrega, id_tarea=tarea, id_alumno=alumno)
+    return {'docente': docente, 'alumno': alumno, 'tarea': tarea}
+
+
+@pytest.mark.parametrize('metodo,ruta,cuerpo', PRIVILEGIADAS)
+def test_operacion_privilegiada_sin_token(cliente, datos, ids, metodo, ruta, cuerpo):
+    ruta = ruta.format(**ids)
+    assert getattr(cliente, metodo)(ruta, json=cuerpo).status_code == 401
+    # Con token de alumno el rol no alcanza
+    cabeceras = datos.cabeceras(ids['alumno'], 'alumno')
+    assert getattr(cliente, metodo)(ruta, json=cuerpo, headers=cabeceras).status_code == 403
+    assert datos.sql('SELECT COUNT(*) FROM usuarios')[0][0] == 2
+    assert datos.sql('SELECT calificacion FROM entregas') == [(None,)]
+
+
+def test_endpoints_del_cliente_movil_siguen_sin_token(cliente, ids):
+    assert cliente.get('/usuarios/').status_code == 200
+    assert cliente.get(f"/tareas/?user_id={ids['alumno']}").status_code == 200
+    tarea = cliente.post('/tareas/', content_type='multipart/form-data',
+                         data={'titulo': 'Sin token', 'creado_por': ids['docente'],
+                               'file': (io.BytesIO(b'guia'), 'guia.pdf')})
+    assert tarea.status_code == 201
+    assert cliente.post('/avisos/', json={'titulo': 'Aviso', 'texto': 'Texto',
+                                          'id_usuario': ids['docente']}).status_code == 201
+    assert cliente.post('/categorias/', json={'nombre': 'Ácidos'}).status_code == 201
+    assert cliente.post('/login', json={'username': 'docente1', 'hash_contraseña': 'secreta'}).status_code == 200
+
+
+def test_auth_obligatoria_rechaza_todo_sin_token(configuracion, ids, datos):
+    configuracion['AUTH_OBLIGATORIA'] = True
+    cliente = create_app(configuracion).test_client()
+    assert cliente.get('/tareas/').status_code == 401
+    assert cliente.get('/tareas/', headers=datos.cabeceras(ids['alumno'], 'alumno')).status_code == 200
@@ -0,0 +1,93 @@
+"""Stock bajo: avisos al cruzar el mínimo con cantidades fraccionarias y el índice parcial."""
+import json
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app import Categoria, db
+from test_stock import a_la_vez, reactivo
+
+
+def test_solicitud_fraccionaria_cruza_el_minimo(cliente, datos):
+    docente, id_reactivo = reactivo(datos, Decimal('2.25'), minimo=2)
+    alumno = datos.usuario('alumno')
+
+    def solicitar(cantidad):
+        return cliente.post('/solicitudes/', json={'id_reactivo': id_reactivo, 'cantidad': cantidad,
+                                                   'proyecto': 'Práctica', 'es_proyecto': False,
+                                                   'id_usuario': alumno})
+    # 0.2 deja 2.05: sigue por encima del mínimo
+    assert solicitar(0.2).status_code == 201
+    assert datos.sql('SELECT COUNT(*) FROM avisos')[0][0] == 0
+    # 0.5 deja 1.55 y cruza
+    assert solicitar(0.5).status_code == 201
+    assert datos.sql('SELECT cantidad FROM reactivos')[0][0] == Decimal('1.55')
+    assert datos.sql('SELECT id_usuario, texto FROM avisos') == [
+        (docente, 'Quedan 1.55 mL de Ácido acético (mínimo 2.00).')]
+    # Ya estaba bajo: no se repite
+    assert solicitar(0.25).status_code == 201
+    assert datos.sql('SELECT COUNT(*) FROM avisos')[0][0] == 1
+
+
+def test_edicion_fraccionaria_cruza_el_minimo(cliente, datos):
+    docente, id_reactivo = reactivo(datos, 3, minimo=1)
+    cabeceras = datos.cabeceras(docente, 'docente')
+    cuerpo = {'nombre': 'Ácido acético', 'unidad': 'mL', 'minimo': 1, 'ubicacion': 'A1',
+              'id_categoria': datos.sql('SELECT id_categoria FROM reactivos')[0][0]}
+    assert cliente.put(f'/reactivos/{id_reactivo}', headers=cabeceras, json=dict(cuerpo, cantidad=0.75)).status_code == 200
+    assert datos.sql('SELECT COUNT(*) FROM avisos')[0][0] == 1
+    # Reponer rearma el aviso
+    assert cliente.put(f'/reactivos/{id_reactivo}', headers=cabeceras, json=dict(cuerpo, cantidad=1.5)).status_code == 200
+    assert cliente.put(f'/reactivos/{id_reactivo}', headers=cabeceras, json=dict(cuerpo, cantidad=0.5)).status_code == 200
+    assert datos.sql('SELECT COUNT(*) FROM avisos')[0][0] == 2
+
+
+def test_listado_bajo_stock_usa_el_indice_parcial(app, cliente, datos):
+    docente = datos.usuario('docente')
+    categoria = datos.crear(Categoria, nombre='Ácidos')
+    datos.sql("""
+        INSERT INTO reactivos (nombre, cantidad, unidad, minimo, ubicacion, id_categoria, creado_por)
+        SELECT 'Reactivo ' || n, CASE WHEN n % 500 = 0 THEN 0.5 ELSE 10 END, 'L', 1, 'A1', :categoria, :docente
+        FROM generate_series(1, 5000) AS n
+    """, categoria=categoria, docente=docente)
+    datos.sql('ANALYZE reactivos')
+    capturadas = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if 'FROM reactivos' in statement:
+            capturadas.append((statement, parameters))
+    with app.app_context():
+        motor = db.engine
+    event.listen(motor, 'before_cursor_execute', capturar)
+    try:
+        respuesta = cliente.get('/reactivos/bajo-stock', headers=datos.cabeceras(docente, 'docente'))
+    finally:
+        event.remove(motor, 'before_cursor_execute', capturar)
+    assert respuesta.status_code == 200
+    assert [r['nombre'] for r in respuesta.get_json()] == [f'Reactivo {n}' for n in range(500, 5001, 500)]
+
+    (sentencia, parametros), = capturadas
+    with app.app_context():
+        conexion = db.engine.raw_connection()
+    try:
+        cursor = conexion.cursor()
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sentencia, parametros)
+        plan = json.dumps(cursor.fetchone()[0])
+    finally:
+        conexion.close()
+    # 10 de 5000 filas: sin el índice parcial el listado recorre toda la tabla
+    assert 'idx_reactivos_bajo_stock' in plan
+
+
+def test_ediciones_concurrentes_avisan_una_vez(cliente, datos):
+    docente, id_reactivo = reactivo(datos, 10, minimo=4)
+    cabeceras = datos.cabeceras(docente, 'docente')
+    cuerpo = {'nombre': 'Ácido acético', 'unidad': 'mL', 'minimo': 4, 'ubicacion': 'A1',
+              'id_categoria': datos.sql('SELECT id_categoria FROM reactivos')[0][0]}
+
+    def editar(numero):
+        return cliente.put(f'/reactivos/{id_reactivo}', headers=cabeceras,
+                           json=dict(cuerpo, cantidad=numero % 3 + 1)).status_code
+    assert a_la_vez(10, editar) == [200] * 10
+    # Solo la primera edición en tomar la fila ve la cantidad anterior por encima del mínimo
+    assert datos.sql('SELECT COUNT(*) FROM avisos')[0][0] == 1
@@ -0,0 +1,82 @@
+"""GET /buscar: texto completo sin acentos, trigramas y los índices GIN de init.sql."""
+import json
+
+from sqlalchemy import event
+
+from app import Aviso, Categoria, Reactivo, Tarea, db
+
+
+def poblar(datos):
+    docente = datos.usuario('docente')
+    categoria = datos.crear(Categoria, nombre='Ácidos')
+    for nombre in ('Ácido Clorhídrico', 'Ácido Sulfúrico', 'Hidróxido de Sodio', 'Agua Destilada'):
+        datos.crear(Reactivo, nombre=nombre, cantidad=1, unidad='L', minimo=0, ubicacion='A1', id_categoria=categoria)
+    datos.crear(Tarea, titulo='Titulación ácido-base', descripcion='Neutralizar el ácido clorhídrico con hidróxido',
+                creado_por=docente)
+    datos.crear(Aviso, id_usuario=docente, titulo='Laboratorio cerrado', texto='No habrá prácticas el lunes')
+    return datos.cabeceras(docente, 'docente')
+
+
+def test_busqueda_sin_acentos_con_fragmento(cliente, datos):
+    cabeceras = poblar(datos)
+    respuesta = cliente.get('/buscar?q=acido clorhidrico', headers=cabeceras)
+    assert respuesta.status_code == 200
+    resultados = respuesta.get_json()['resultados']
+    assert (resultados[0]['tipo'], resultados[0]['titulo']) == ('reactivos', 'Ácido Clorhídrico')
+    assert '<b>Ácido</b> <b>Clorhídrico</b>' in resultados[0]['fragmento']
+    # La tarea lo menciona en la descripción
+    assert ('tareas', 'Titulación ácido-base') in {(r['tipo'], r['titulo']) for r in resultados}
+    assert all(r['puntaje'] > 0 for r in resultados)
+
+
+def test_busqueda_tolera_errores_de_escritura(cliente, datos):
+    cabeceras = poblar(datos)
+    resultados = cliente.get('/buscar?q=clorhidrco&tipos=reactivos', headers=cabeceras).get_json()['resultados']
+    assert [r['titulo'] for r in resultados] == ['Ácido Clorhídrico']
+    resultados = cliente.get('/buscar?q=laboratorio cerado&tipos=avisos', headers=cabeceras).get_json()['resultados']
+    assert [r['titulo'] for r in resultados] == ['Laboratorio cerrado']
+
+
+def test_busqueda_pagina_y_valida(cliente, datos):
+    cabeceras = poblar(datos)
+    primera = cliente.get('/buscar?q=acido&tipos=reactivos&limit=1', headers=cabeceras).get_json()
+    segunda = cliente.get('/buscar?q=acido&tipos=reactivos&limit=1&offset=1', headers=cabeceras).get_json()
+    assert primera['hay_mas'] is True
+    assert segunda['hay_mas'] is False
+    assert {primera['resultados'][0]['titulo'], segunda['resultados'][0]['titulo']} == {
+        'Ácido Clorhídrico', 'Ácido Sulfúrico'}
+    assert cliente.get('/buscar?q=%20', headers=cabeceras).status_code == 400
+    assert cliente.get('/buscar?q=acido&tipos=usuarios', headers=cabeceras).status_code == 400
+
+
+def test_busqueda_usa_los_indices_gin(app, cliente, datos):
+    """Las expresiones de la consulta coinciden con los índices de init.sql y migraciones/004."""
+    cabeceras = poblar(datos)
+    capturadas = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if 'websearch_to_tsquery' in statement and 'ts_headline' not in statement:
+            capturadas.append((statement, parameters))
+    with app.app_context():
+        motor = db.engine
+    event.listen(motor, 'before_cursor_execute', capturar)
+    try:
+        assert cliente.get('/buscar?q=acido clorhidrico', headers=cabeceras).status_code == 200
+    finally:
+        event.remove(motor, 'before_cursor_execute', capturar)
+    (sentencia, parametros), = capturadas
+
+    with app.app_context():
+        conexion = db.engine.raw_connection()
+    try:
+        cursor = conexion.cursor()
+        # Con pocas filas el planificador prefiere recorrer la tabla; sin esa opción debe poder usar los índices
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sentencia, parametros)
+        plan = json.dumps(cursor.fetchone()[0])
+        conexion.rollback()
+    finally:
+        conexion.close()
+    for indice in ('idx_reactivos_busqueda', 'idx_reactivos_nombre_trgm', 'idx_tareas_busqueda',
+                   'idx_tareas_titulo_trgm', 'idx_avisos_busqueda', 'idx_avisos_titulo_trgm'):
+        assert indice in plan
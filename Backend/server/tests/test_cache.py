@@ -0,0 +1,39 @@
+"""Caché de respuestas: invalidación, contadores y un solo backend para todos los workers."""
+import threading
+
+import pytest
+
+from app import CacheMemoria, create_app
+
+
+def test_cache_en_memoria_rechaza_varios_workers(configuracion):
+    configuracion['CACHE_PROCESOS'] = 4
+    with pytest.raises(RuntimeError, match='CACHE_URL'):
+        create_app(configuracion)
+
+
+def test_aciertos_fallos_e_invalidacion(cliente, datos):
+    admin = datos.usuario('admin')
+    cabeceras = datos.cabeceras(admin, 'admin')
+    assert cliente.get('/categorias/').get_json() == []
+    assert cliente.get('/categorias/').get_json() == []
+    assert cliente.post('/categorias/', json={'nombre': 'Ácidos'}, headers=cabeceras).status_code == 201
+    # El commit cambió la versión de categorias: la entrada anterior ya no se usa
+    assert [categoria['nombre'] for categoria in cliente.get('/categorias/').get_json()] == ['Ácidos']
+    estadisticas = cliente.get('/cache/estadisticas').get_json()
+    assert (estadisticas['backend'], estadisticas['aciertos'], estadisticas['fallos']) == ('CacheMemoria', 1, 2)
+
+
+def test_contadores_con_hilos():
+    memoria = CacheMemoria(10, 60)
+
+    def consultar():
+        for _ in range(5000):
+            memoria.contar('aciertos')
+            memoria.contar('fallos')
+    hilos = [threading.Thread(target=consultar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert memoria.estadisticas() == {'aciertos': 40000, 'fallos': 40000}
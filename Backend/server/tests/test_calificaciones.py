@@ -0,0 +1,81 @@
+"""Calificación en lote con un solo UPDATE y estadísticas de calificaciones en SQL."""
+from datetime import date, datetime, time
+
+from app import Entrega, Tarea
+
+
+def poblar(datos, alumnos=4):
+    docente = datos.usuario('docente')
+    inscritos = [datos.usuario('alumno', apellido=f'Apellido{numero}') for numero in range(alumnos)]
+    tarea = datos.crear(Tarea, titulo='Práctica', fecha_entrega=date(2030, 1, 1), creado_por=docente)
+    otra = datos.crear(Tarea, titulo='Otra', fecha_entrega=date(2030, 1, 1), creado_por=docente)
+    return docente, inscritos, tarea, otra
+
+
+def test_calificacion_en_lote(cliente, datos, sentencias):
+    docente, (ana, luis, *_), tarea, otra = poblar(datos)
+    cabeceras = datos.cabeceras(docente, 'docente')
+    de_ana = datos.crear(Entrega, id_tarea=tarea, id_alumno=ana, observaciones='Revisar')
+    de_luis = datos.crear(Entrega, id_tarea=tarea, id_alumno=luis)
+    ajena = datos.crear(Entrega, id_tarea=otra, id_alumno=ana)
+
+    with sentencias() as ejecutadas:
+        respuesta = cliente.put(f'/tareas/{tarea}/calificaciones', headers=cabeceras, json=[
+            {'id_entrega': de_ana, 'calificacion': 8.5},
+            {'id_entrega': de_luis, 'calificacion': '9', 'observaciones': 'Muy bien'},
+            {'id_entrega': ajena, 'calificacion': 10},
+        ])
+    assert respuesta.status_code == 200
+    assert respuesta.get_json() == {'id_tarea': tarea, 'calificadas': 2, 'no_encontradas': [ajena]}
+    assert sum('UPDATE entregas' in sentencia for sentencia in ejecutadas) == 1
+    assert datos.sql('SELECT id, calificacion, observaciones FROM entregas ORDER BY id') == [
+        (de_ana, 8.5, 'Revisar'), (de_luis, 9, 'Muy bien'), (ajena, None, None)]
+    # El cambio llega a /sync
+    assert {(fila.recurso, fila.id_registro) for fila in datos.sql('SELECT recurso, id_registro FROM cambios')} >= {
+        ('entregas', de_ana), ('entregas', de_luis)}
+
+
+def test_calificacion_en_lote_valida_todo_antes_de_escribir(cliente, datos):
+    docente, (ana, *_), tarea, _ = poblar(datos)
+    cabeceras = datos.cabeceras(docente, 'docente')
+    entrega = datos.crear(Entrega, id_tarea=tarea, id_alumno=ana)
+    respuesta = cliente.put(f'/tareas/{tarea}/calificaciones', headers=cabeceras, json=[
+        {'id_entrega': entrega, 'calificacion': 7},
+        {'id_entrega': entrega, 'calificacion': 8},
+        {'id_entrega': entrega, 'calificacion': -1},
+        {'calificacion': 5},
+    ])
+    assert respuesta.status_code == 400
+    assert [error['fila'] for error in respuesta.get_json()['errores']] == [2, 3, 4]
+    assert datos.sql('SELECT calificacion FROM entregas') == [(None,)]
+    assert cliente.put(f'/tareas/{tarea}/calificaciones', headers=cabeceras, json=[]).status_code == 400
+    assert cliente.put('/tareas/999/calificaciones', headers=cabeceras,
+                       json=[{'id_entrega': entrega, 'calificacion': 7}]).status_code == 404
+
+
+def test_estadisticas_de_la_tarea(cliente, datos):
+    docente, (ana, luis, eva, _), tarea, _ = poblar(datos)
+    cabeceras = datos.cabeceras(docente, 'docente')
+    a_tiempo = datetime(2029, 12, 31, 12)
+    tarde = datetime.combine(date(2030, 1, 2), time(8))
+    for alumno, calificacion, fecha in ((ana, 4, a_tiempo), (luis, 8, a_tiempo), (eva, 10, tarde)):
+        datos.crear(Entrega, id_tarea=tarea, id_alumno=alumno, calificacion=calificacion, fecha_entrega=fecha)
+    datos.crear(Entrega, id_tarea=tarea, id_alumno=ana, fecha_entrega=a_tiempo)  # reenvío sin calificar
+
+    respuesta = cliente.get(f'/tareas/{tarea}/estadisticas?cubetas=5&faltantes=true', headers=cabeceras)
+    assert respuesta.status_code == 200
+    estadisticas = respuesta.get_json()
+    assert {campo: estadisticas[campo] for campo in ('entregas', 'entregados', 'calificadas', 'faltantes')} == {
+        'entregas': 4, 'entregados': 3, 'calificadas': 3, 'faltantes': 1}
+    assert (estadisticas['promedio'], estadisticas['mediana'], estadisticas['minima'], estadisticas['maxima']) == (
+        7.33, 8.0, 4.0, 10.0)
+    assert estadisticas['desviacion'] == 3.06
+    # El 10 cae en el último intervalo aunque sea el borde superior
+    assert [cubeta['cantidad'] for cubeta in estadisticas['distribucion']] == [0, 0, 1, 0, 2]
+    assert [cubeta['desde'] for cubeta in estadisticas['distribucion']] == [0, 2, 4, 6, 8]
+    assert [alumno['apellido'] for alumno in estadisticas['alumnos_faltantes']] == ['Apellido3']
+
+    vacia = cliente.get(f'/tareas/{tarea + 1}/estadisticas', headers=cabeceras).get_json()
+    assert (vacia['entregas'], vacia['promedio'], vacia['faltantes']) == (0, None, 4)
+    assert cliente.get(f'/tareas/{tarea}/estadisticas?maximo=0', headers=cabeceras).status_code == 400
+    assert cliente.get(f'/tareas/{tarea}/estadisticas', headers=datos.cabeceras(ana, 'alumno')).status_code == 403
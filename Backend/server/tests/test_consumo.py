@@ -0,0 +1,92 @@
+"""Acumulado diario de consumo: se mantiene con cada alta, baja e importación de solicitudes."""
+from datetime import date
+
+from app import Categoria, Reactivo
+
+ACUMULADO = """
+    SELECT dia, id_reactivo, id_usuario, proyecto, es_proyecto, total, solicitudes
+    FROM consumo_diario WHERE solicitudes > 0 ORDER BY 1, 2, 3, 4, 5
+"""
+DESDE_SOLICITUDES = """
+    SELECT fecha_solicitud::date, id_reactivo, id_usuario, proyecto, es_proyecto, SUM(cantidad), COUNT(*)
+    FROM solicitudes GROUP BY 1, 2, 3, 4, 5 ORDER BY 1, 2, 3, 4, 5
+"""
+
+
+def poblar(datos):
+    docente = datos.usuario('docente')
+    alumnos = [datos.usuario('alumno'), datos.usuario('alumno')]
+    acidos = datos.crear(Categoria, nombre='Ácidos')
+    vidrio = datos.crear(Categoria, nombre='Vidriería')
+    reactivos = [
+        datos.crear(Reactivo, nombre='Ácido acético', cantidad=100, unidad='mL', minimo=0, ubicacion='A1',
+                    id_categoria=acidos, creado_por=docente),
+        datos.crear(Reactivo, nombre='Tubos de ensayo', cantidad=100, unidad='pz', minimo=0, ubicacion='G1',
+                    id_categoria=vidrio, creado_por=docente),
+    ]
+    return datos.cabeceras(docente, 'docente'), alumnos, reactivos, acidos
+
+
+def solicitar(cliente, id_reactivo, cantidad, id_usuario, proyecto='Práctica', es_proyecto=False):
+    respuesta = cliente.post('/solicitudes/', json={'id_reactivo': id_reactivo, 'cantidad': cantidad,
+                                                    'proyecto': proyecto, 'es_proyecto': es_proyecto,
+                                                    'id_usuario': id_usuario})
+    assert respuesta.status_code == 201, respuesta.get_data(as_text=True)
+    return respuesta.get_json()['id_solicitud']
+
+
+def test_acumulado_sigue_a_altas_bajas_e_importaciones(cliente, datos):
+    cabeceras, (ana, luis), (acido, tubos), _ = poblar(datos)
+    solicitar(cliente, acido, 2.5, ana)
+    solicitar(cliente, acido, 1.5, ana)
+    borrada = solicitar(cliente, acido, 4, luis, 'Tesis', True)
+    solicitar(cliente, tubos, 3, luis, 'Tesis', True)
+    respuesta = cliente.post('/solicitudes/lote', headers=cabeceras, json=[
+        {'id_reactivo': acido, 'cantidad': 1, 'proyecto': 'Práctica', 'es_proyecto': False, 'id_usuario': ana},
+        {'id_reactivo': tubos, 'cantidad': 2, 'proyecto': 'Tesis', 'es_proyecto': True, 'id_usuario': luis},
+        {'id_reactivo': tubos, 'cantidad': 1, 'proyecto': 'Tesis', 'es_proyecto': True, 'id_usuario': luis},
+    ])
+    assert respuesta.get_json()['guardados'] == 3
+    assert cliente.delete(f'/solicitudes/{borrada}').status_code == 200
+
+    hoy = date.today()
+    acumulado = datos.sql(ACUMULADO)
+    assert [(fila.id_reactivo, fila.id_usuario, fila.total, fila.solicitudes) for fila in acumulado] == [
+        (acido, ana, 5, 3), (tubos, luis, 6, 3)]
+    assert {fila.dia for fila in acumulado} == {hoy}
+    assert acumulado == datos.sql(DESDE_SOLICITUDES)
+
+    # Reconstruir desde cero da lo mismo y descarta las filas que quedaron en cero
+    assert cliente.post('/analitica/consumo/reconstruir', headers=cabeceras).get_json() == {'filas': 2}
+    assert datos.sql(ACUMULADO) == acumulado
+
+
+def test_consumo_por_periodo_y_dimension(cliente, datos):
+    cabeceras, (ana, luis), (acido, tubos), acidos = poblar(datos)
+    solicitar(cliente, acido, 2, ana)
+    solicitar(cliente, acido, 3, luis, 'Tesis', True)
+    solicitar(cliente, tubos, 5, luis, 'Tesis', True)
+    inicio_mes = date.today().replace(day=1).isoformat()
+
+    por_reactivo = cliente.get('/analitica/consumo?periodo=mes', headers=cabeceras).get_json()
+    assert por_reactivo == [
+        {'periodo': inicio_mes, 'id_reactivo': acido, 'reactivo': 'Ácido acético', 'unidad': 'mL',
+         'total': 5.0, 'solicitudes': 2},
+        {'periodo': inicio_mes, 'id_reactivo': tubos, 'reactivo': 'Tubos de ensayo', 'unidad': 'pz',
+         'total': 5.0, 'solicitudes': 1},
+    ]
+    por_proyecto = cliente.get('/analitica/consumo?agrupar=proyecto&es_proyecto=true',
+                               headers=cabeceras).get_json()
+    # Las unidades no se mezclan aunque sea el mismo proyecto
+    assert [(fila['proyecto'], fila['unidad'], fila['total']) for fila in por_proyecto] == [
+        ('Tesis', 'mL', 3.0), ('Tesis', 'pz', 5.0)]
+    por_categoria = cliente.get(f'/analitica/consumo?agrupar=categoria&id_categoria={acidos}',
+                                headers=cabeceras).get_json()
+    assert [(fila['categoria'], fila['total'], fila['solicitudes']) for fila in por_categoria] == [
+        ('Ácidos', 5.0, 2)]
+
+    # Una baja se refleja en la siguiente consulta pese a la caché
+    id_solicitud = datos.sql('SELECT id_solicitud FROM solicitudes WHERE id_reactivo = :id', id=tubos)[0][0]
+    assert cliente.delete(f'/solicitudes/{id_solicitud}').status_code == 200
+    por_reactivo = cliente.get('/analitica/consumo?periodo=mes', headers=cabeceras).get_json()
+    assert [fila['id_reactivo'] for fila in por_reactivo] == [acido]
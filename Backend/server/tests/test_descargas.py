@@ -0,0 +1,110 @@
+"""GET /download: almacenamiento por contenido, ETag, 304, rangos y descarga por el proxy."""
+import hashlib
+import io
+import os
+
+CONTENIDO = b'%PDF-1.4 practica de laboratorio ' * 100
+DIGEST = hashlib.sha256(CONTENIDO).hexdigest()
+
+
+def subir_tarea(cliente, cabeceras, contenido=CONTENIDO, titulo='Práctica'):
+    respuesta = cliente.post('/tareas/', headers=cabeceras, content_type='multipart/form-data',
+                             data={'titulo': titulo, 'file': (io.BytesIO(contenido), 'guia.pdf')})
+    assert respuesta.status_code == 201, respuesta.get_data(as_text=True)
+    return respuesta.get_json()
+
+
+def test_subida_se_guarda_por_contenido(app, cliente, datos):
+    cabeceras = datos.cabeceras(datos.usuario('docente'), 'docente')
+    primera = subir_tarea(cliente, cabeceras)
+    segunda = subir_tarea(cliente, cabeceras, titulo='Otra práctica')
+    ruta = os.path.join(app.config['UPLOAD_FOLDER'], DIGEST[:2], DIGEST[2:4], f'{DIGEST}.pdf')
+    assert primera['archivo_ruta'] == segunda['archivo_ruta'] == ruta
+    with open(ruta, 'rb') as archivo:
+        assert archivo.read() == CONTENIDO
+    # Sin temporales olvidados
+    assert os.listdir(os.path.join(app.config['UPLOAD_FOLDER'], 'tmp')) == []
+
+
+def test_descarga_condicional_y_por_rangos(cliente, datos):
+    cabeceras = datos.cabeceras(datos.usuario('docente'), 'docente')
+    tarea = subir_tarea(cliente, cabeceras)
+    ruta = f"/download/tarea/{tarea['id']}"
+
+    completa = cliente.get(ruta, headers=cabeceras)
+    assert completa.status_code == 200
+    assert completa.data == CONTENIDO
+    assert completa.headers['ETag'] == f'"{DIGEST}"'
+    assert completa.headers['Accept-Ranges'] == 'bytes'
+    ultima_modificacion = completa.headers['Last-Modified']
+
+    por_etag = cliente.get(ruta, headers=dict(cabeceras, **{'If-None-Match': f'"{DIGEST}"'}))
+    assert por_etag.status_code == 304
+    assert por_etag.data == b''
+    por_fecha = cliente.get(ruta, headers=dict(cabeceras, **{'If-Modified-Since': ultima_modificacion}))
+    assert por_fecha.status_code == 304
+    otro_etag = cliente.get(ruta, headers=dict(cabeceras, **{'If-None-Match': '"otro"'}))
+    assert otro_etag.status_code == 200
+
+    rango = cliente.get(ruta, headers=dict(cabeceras, Range='bytes=100-199'))
+    assert rango.status_code == 206
+    assert rango.data == CONTENIDO[100:200]
+    assert rango.headers['Content-Range'] == f'bytes 100-199/{len(CONTENIDO)}'
+    # If-Range con el ETag vigente respeta el rango; con uno viejo devuelve todo
+    vigente = cliente.get(ruta, headers=dict(cabeceras, Range='bytes=0-9', **{'If-Range': f'"{DIGEST}"'}))
+    assert vigente.status_code == 206
+    viejo = cliente.get(ruta, headers=dict(cabeceras, Range='bytes=0-9', **{'If-Range': '"viejo"'}))
+    assert viejo.status_code == 200
+    assert viejo.data == CONTENIDO
+
+
+def test_descarga_delegada_a_nginx(app, cliente, datos):
+    app.config['SENDFILE_MODO'] = 'nginx'
+    cabeceras = datos.cabeceras(datos.usuario('docente'), 'docente')
+    tarea = subir_tarea(cliente, cabeceras)
+    ruta = f"/download/tarea/{tarea['id']}"
+
+    respuesta = cliente.get(ruta, headers=cabeceras)
+    assert respuesta.status_code == 200
+    assert respuesta.data == b''
+    assert respuesta.headers['X-Accel-Redirect'] == f'/uploads-internos/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.pdf'
+    assert respuesta.headers['ETag'] == f'"{DIGEST}"'
+    condicional = cliente.get(ruta, headers=dict(cabeceras, **{'If-None-Match': f'"{DIGEST}"'}))
+    assert condicional.status_code == 304
+    assert 'X-Accel-Redirect' not in condicional.headers
+
+
+def test_descarga_sin_archivo(cliente, datos):
+    cabeceras = datos.cabeceras(datos.usuario('docente'), 'docente')
+    tarea = cliente.post('/tareas/', headers=cabeceras, data={'titulo': 'Sin guía'}).get_json()
+    assert cliente.get(f"/download/tarea/{tarea['id']}", headers=cabeceras).status_code == 404
+    assert cliente.get('/download/otro/1', headers=cabeceras).status_code == 400
+
+
+def test_barrer_huerfanos(app, cliente, datos):
+    cabeceras = datos.cabeceras(datos.usuario('docente'), 'docente')
+    referenciado = subir_tarea(cliente, cabeceras)['archivo_ruta']
+    huerfanos = []
+    for contenido in (b'version anterior', b'reutilizado hace poco'):
+        digest = hashlib.sha256(contenido).hexdigest()
+        ruta = os.path.join(app.config['UPLOAD_FOLDER'], digest[:2], digest[2:4], f'{digest}.pdf')
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, 'wb') as archivo:
+            archivo.write(contenido)
+        huerfanos.append(ruta)
+    anterior = os.path.join(app.config['UPLOAD_FOLDER'], 'guia_vieja.pdf')
+    open(anterior, 'wb').close()
+    # Fuera de la gracia, salvo el reutilizado hace poco
+    for ruta in (referenciado, huerfanos[0], anterior):
+        os.utime(ruta, (1, 1))
+
+    simulado = app.test_cli_runner().invoke(args=['barrer-huerfanos', '--simular'])
+    assert simulado.exit_code == 0, simulado.output
+    assert simulado.output.splitlines()[0] == huerfanos[0]
+    assert os.path.exists(huerfanos[0])
+
+    resultado = app.test_cli_runner().invoke(args=['barrer-huerfanos'])
+    assert resultado.output.startswith('Borrados 1 archivos huérfanos')
+    assert not os.path.exists(huerfanos[0])
+    # Referenciados, recientes y los que no siguen el esquema por contenido quedan
+    assert all(map(os.path.exists, (referenciado, huerfanos[1], anterior)))
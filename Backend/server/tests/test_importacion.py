@@ -0,0 +1,88 @@
+"""Importación masiva: lotes con INSERT de varias filas y reintento fila por fila."""
+
+from app import Categoria
+from test_stock import reactivo
+
+
+def usuario(username, contraseña='clave-importada'):
+    return {'username': username, 'nombre': 'Nombre', 'apellido': 'Apellido', 'email': f'{username}@sigel.test',
+            'hash_contraseña': contraseña, 'rol': 'alumno'}
+
+
+def test_usuarios_importados_junto_a_un_conflicto_inician_sesion(cliente, datos):
+    admin = datos.usuario('admin')
+    datos.usuario('alumno', username='repetido')
+    respuesta = cliente.post('/usuarios/lote', headers=datos.cabeceras(admin, 'admin'), json=[
+        usuario('nuevo1'), usuario('repetido'), usuario('nuevo2', 'otra-clave')])
+    assert respuesta.status_code == 200
+    resultado = respuesta.get_json()
+    assert (resultado['procesados'], resultado['guardados']) == (3, 2)
+    assert [error['fila'] for error in resultado['errores']] == [2]
+
+    # El lote falló por el username repetido y se reintentó fila por fila:
+    # la contraseña se cifra una sola vez
+    for username, contraseña in (('nuevo1', 'clave-importada'), ('nuevo2', 'otra-clave')):
+        sesion = cliente.post('/login', json={'username': username, 'hash_contraseña': contraseña})
+        assert sesion.status_code == 200, username
+    assert cliente.post('/login', json={'username': 'repetido', 'hash_contraseña': 'clave-importada'}).status_code == 401
+
+
+def test_importacion_cifra_barato_y_el_login_lo_reemplaza(cliente, datos):
+    admin = datos.usuario('admin')
+    assert cliente.post('/usuarios/lote', headers=datos.cabeceras(admin, 'admin'),
+                        json=[usuario('nuevo')]).get_json()['guardados'] == 1
+    hash_importado = datos.sql("SELECT hash_contraseña FROM usuarios WHERE username = 'nuevo'")[0][0]
+    assert hash_importado.startswith('pbkdf2:sha256:10000$')
+
+    assert cliente.post('/login', json={'username': 'nuevo', 'hash_contraseña': 'clave-importada'}).status_code == 200
+    # HASH_METODO de las pruebas
+    assert datos.sql("SELECT hash_contraseña FROM usuarios WHERE username = 'nuevo'")[0][0].startswith(
+        'pbkdf2:sha256:1000$')
+    assert cliente.post('/login', json={'username': 'nuevo', 'hash_contraseña': 'clave-importada'}).status_code == 200
+
+
+def test_solicitudes_reparten_el_stock_fila_por_fila(cliente, datos):
+    docente, id_reactivo = reactivo(datos, 10)
+    alumno = datos.usuario('alumno')
+
+    def solicitud(cantidad, id_usuario=alumno, id_reactivo=id_reactivo):
+        return {'id_reactivo': id_reactivo, 'cantidad': cantidad, 'proyecto': 'Práctica', 'es_proyecto': False,
+                'id_usuario': id_usuario}
+    respuesta = cliente.post('/solicitudes/lote', headers=datos.cabeceras(docente, 'docente'), json=[
+        solicitud(4),
+        solicitud(8),                    # no alcanza: quedan 6
+        solicitud(5),
+        solicitud(0.5, id_usuario=999),  # usuario inexistente: el lote se reintenta fila por fila
+        solicitud(2),                    # no alcanza: queda 1
+        solicitud(1),
+        solicitud(1, id_reactivo=999),
+    ])
+    resultado = respuesta.get_json()
+    assert (resultado['procesados'], resultado['guardados']) == (7, 3)
+    # Cada error una sola vez, aunque el primer intento del lote se descartó
+    assert [error['fila'] for error in resultado['errores']] == [2, 4, 5, 7]
+    assert 'id_usuario' in resultado['errores'][1]['error']
+    assert datos.sql('SELECT cantidad FROM solicitudes ORDER BY id_solicitud') == [(4,), (5,), (1,)]
+    assert datos.sql('SELECT cantidad FROM reactivos')[0][0] == 0
+    assert datos.sql('SELECT SUM(total), SUM(solicitudes) FROM consumo_diario')[0] == (10, 3)
+
+
+def test_alta_despues_de_importar_ids_explicitos(cliente, datos):
+    docente = datos.usuario('docente')
+    categoria = datos.crear(Categoria, nombre='Ácidos')
+    cabeceras = datos.cabeceras(docente, 'docente')
+
+    def reactivo_importado(**valores):
+        return {'nombre': 'Etanol', 'cantidad': 5, 'unidad': 'L', 'minimo': 1, 'ubicacion': 'A1',
+                'id_categoria': categoria, **valores}
+    respuesta = cliente.post('/reactivos/lote?modo=upsert', headers=cabeceras,
+                             json=[reactivo_importado(id_reactivo=1), reactivo_importado(id_reactivo=40)])
+    assert respuesta.get_json()['guardados'] == 2
+
+    nuevo = cliente.post('/reactivos/', headers=cabeceras, json=reactivo_importado(creado_por=docente))
+    assert nuevo.status_code == 201, nuevo.get_data(as_text=True)
+    assert nuevo.get_json()['id_reactivo'] == 41
+    # Un lote con ids menores no hace retroceder la secuencia
+    cliente.post('/reactivos/lote', headers=cabeceras, json=[reactivo_importado(id_reactivo=7)])
+    assert cliente.post('/reactivos/', headers=cabeceras,
+                        json=reactivo_importado(creado_por=docente)).get_json()['id_reactivo'] == 42
@@ -0,0 +1,63 @@
+"""Sentencias SQL por listado: no deben crecer con la cantidad de filas (N+1)."""
+from datetime import date
+
+import pytest
+
+from app import Aviso, Categoria, Entrega, Reactivo, Solicitud, Tarea
+
+LISTADOS = [
+    '/usuarios/',
+    '/categorias/',
+    '/reactivos/',
+    '/reactivos/bajo-stock',
+    '/solicitudes/',
+    '/tareas/',
+    '/tareas/?user_id={alumno}',
+    '/entregas/',
+    '/avisos/',
+    '/tareas/{tarea}/entregas',
+    '/usuarios/{alumno}/entregas',
+    '/sync?since=0&recursos=tareas',
+]
+
+
+def poblar(datos, filas):
+    """``filas`` registros de cada recurso, cada uno con relaciones distintas."""
+    ids = {}
+    for _ in range(filas):
+        docente = datos.usuario('docente')
+        alumno = datos.usuario('alumno')
+        categoria = datos.crear(Categoria, nombre='Ácidos')
+        reactivo = datos.crear(Reactivo, nombre='Ácido clorhídrico', cantidad=1, unidad='L', minimo=2,
+                               ubicacion='A1', id_categoria=categoria, creado_por=docente)
+        datos.crear(Solicitud, id_reactivo=reactivo, cantidad=1, proyecto='Tesis', es_proyecto=True,
+                    id_usuario=alumno)
+        tarea = datos.crear(Tarea, titulo='Práctica', fecha_entrega=date(2030, 1, 1), creado_por=docente)
+        datos.crear(Entrega, id_tarea=tarea, id_alumno=alumno)
+        datos.crear(Aviso, id_usuario=docente, titulo='Aviso', texto='Texto')
+        ids = {'alumno': alumno, 'tarea': tarea, 'docente': docente}
+    return ids
+
+
+@pytest.mark.parametrize('ruta', LISTADOS)
+def test_sentencias_constantes_por_listado(cliente, datos, sentencias, ruta):
+    cuentas = []
+    for filas in (1, 5):
+        ids = poblar(datos, filas)
+        cabeceras = datos.cabeceras(ids['docente'], 'docente')
+        with sentencias() as ejecutadas:
+            respuesta = cliente.get(ruta.format(**ids), headers=cabeceras)
+        assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+        cuentas.append(len(ejecutadas))
+    assert cuentas[0] == cuentas[1], f'{ruta}: {cuentas[0]} sentencias con 1 fila y {cuentas[1]} con 6'
+    assert cuentas[1] <= 3
+
+
+def test_listado_sin_anidados_no_los_carga(cliente, datos, sentencias):
+    ids = poblar(datos, 3)
+    with sentencias() as ejecutadas:
+        respuesta = cliente.get('/entregas/?fields=id,id_alumno', headers=datos.cabeceras(ids['docente'], 'docente'))
+    assert respuesta.status_code == 200
+    assert respuesta.get_json()[0].keys() == {'id', 'id_alumno'}
+    assert len(ejecutadas) == 1
+    assert 'JOIN' not in ejecutadas[0]
@@ -0,0 +1,71 @@
+"""POST /batch con paralelo=true: los hilos del lote respetan el presupuesto del pool."""
+import threading
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+
+LECTURAS = [{'ruta': ruta} for ruta in ('/categorias/', '/reactivos/', '/avisos/', '/tareas/')]
+
+
+@pytest.fixture
+def lote(configuracion):
+    """(cliente, hilos que consultaron la base) para una aplicación con la configuración dada."""
+    aplicaciones = []
+
+    def crear(**cambios):
+        aplicacion = create_app(dict(configuracion, **cambios))
+        aplicaciones.append(aplicacion)
+        hilos = []
+        with aplicacion.app_context():
+            event.listen(db.engine, 'before_cursor_execute',
+                         lambda *args: hilos.append(threading.current_thread().name))
+        return aplicacion, hilos
+    yield crear
+    for aplicacion in aplicaciones:
+        with aplicacion.app_context():
+            db.engine.dispose()
+
+
+def libres(aplicacion):
+    cupo = aplicacion.extensions['sigel_cupo_lotes']
+    obtenidos = 0
+    while cupo.acquire(blocking=False):
+        obtenidos += 1
+    for _ in range(obtenidos):
+        cupo.release()
+    return obtenidos
+
+
+def enviar(aplicacion):
+    respuesta = aplicacion.test_client().post('/batch', json={'peticiones': LECTURAS, 'paralelo': True})
+    assert [sub['status'] for sub in respuesta.get_json()['respuestas']] == [200] * len(LECTURAS)
+
+
+def test_reparte_dentro_del_cupo(lote):
+    aplicacion, hilos = lote(BATCH_CONEXIONES=3)
+    enviar(aplicacion)
+    assert 1 < len({hilo for hilo in hilos if hilo.startswith('sigel-lote')}) <= 3
+    assert libres(aplicacion) == 3
+
+
+def test_sin_cupo_se_ejecuta_en_orden(lote):
+    aplicacion, hilos = lote(BATCH_CONEXIONES=1)
+    enviar(aplicacion)
+    assert hilos and not any(hilo.startswith('sigel-lote') for hilo in hilos)
+    # Por defecto el cupo es un cuarto del pool
+    assert libres(lote(DB_POOL_SIZE=8, DB_MAX_OVERFLOW=0)[0]) == 2
+
+
+def test_pool_casi_lleno_se_ejecuta_en_orden(lote):
+    aplicacion, hilos = lote(DB_POOL_SIZE=4, DB_MAX_OVERFLOW=0, BATCH_CONEXIONES=4)
+    with aplicacion.app_context():
+        ocupadas = [db.engine.connect() for _ in range(3)]
+    try:
+        enviar(aplicacion)
+    finally:
+        for conexion in ocupadas:
+            conexion.close()
+    assert hilos and not any(hilo.startswith('sigel-lote') for hilo in hilos)
+    assert libres(aplicacion) == 4
@@ -0,0 +1,32 @@
+"""Medición de sentencias SQL por petición."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+from app import db, sentencias_peticion
+
+
+def test_sentencia_fallida_no_deja_su_inicio_en_la_conexion(app):
+    with app.app_context():
+        with db.engine.connect() as conexion:
+            for _ in range(3):
+                with pytest.raises(ProgrammingError):
+                    conexion.execute(text('SELECT * FROM tabla_inexistente'))
+                conexion.rollback()
+            conexion.execute(text('SELECT 1'))
+            assert conexion.connection.info['inicio_consulta'] == []
+
+
+def test_la_sentencia_fallida_cuenta_en_la_peticion(app):
+    @app.get('/prueba-sql-fallida')
+    def fallar():
+        try:
+            db.session.execute(text('SELECT * FROM tabla_inexistente'))
+        except ProgrammingError:
+            db.session.rollback()
+        db.session.execute(text('SELECT 1'))
+        return {}
+
+    assert app.test_client().get('/prueba-sql-fallida').status_code == 200
+    _, sentencias, peticiones = sentencias_peticion.series[('/prueba-sql-fallida', 'GET')]
+    assert (sentencias, peticiones) == (2, 1)
@@ -0,0 +1,114 @@
+"""database/migraciones/ sobre el esquema anterior deja lo mismo que init.sql."""
+import glob
+import os
+
+import psycopg2
+import pytest
+from sqlalchemy.engine import make_url
+
+from conftest import TABLAS, conectar
+
+MIGRACIONES = sorted(glob.glob(os.path.join(os.path.dirname(__file__), '..', '..', 'database', 'migraciones', '*.sql')))
+ESQUEMA_ANTERIOR = os.path.join(os.path.dirname(__file__), 'esquema_anterior.sql')
+
+COLUMNAS = """
+    SELECT table_name, column_name, data_type, character_maximum_length, numeric_precision, numeric_scale,
+           is_nullable, column_default
+    FROM information_schema.columns WHERE table_schema = 'public' AND table_name = ANY(%s)
+    ORDER BY table_name, column_name
+"""
+INDICES = """
+    SELECT tablename, indexname, indexdef FROM pg_indexes
+    WHERE schemaname = 'public' AND tablename = ANY(%s) ORDER BY indexname
+"""
+RESTRICCIONES = """
+    SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint
+    WHERE connamespace = 'public'::regnamespace AND conrelid::regclass::text = ANY(%s) ORDER BY conname
+"""
+
+
+def aplicar(conexion, ruta):
+    """Como psql -f: con CONCURRENTLY cada sentencia va fuera de una transacción."""
+    with open(ruta, encoding='utf-8') as archivo:
+        script = archivo.read()
+    with conexion.cursor() as cursor:
+        if 'CONCURRENTLY' not in script:
+            cursor.execute(script)
+            return
+        codigo = '\n'.join(linea for linea in script.splitlines() if not linea.lstrip().startswith('--'))
+        for sentencia in filter(str.strip, codigo.split(';')):
+            cursor.execute(sentencia)
+
+
+def esquema(conexion):
+    with conexion.cursor() as cursor:
+        return {consulta: cursor.execute(consulta, (list(TABLAS),)) or cursor.fetchall()
+                for consulta in (COLUMNAS, INDICES, RESTRICCIONES)}
+
+
+@pytest.fixture
+def migrada(base_de_datos):
+    nombre = make_url(base_de_datos).database + '_migraciones'
+    mantenimiento = conectar(base_de_datos, database='postgres')
+    mantenimiento.autocommit = True
+    with mantenimiento.cursor() as cursor:
+        cursor.execute(f'DROP DATABASE IF EXISTS "{nombre}"')
+        cursor.execute(f'CREATE DATABASE "{nombre}"')
+    conexion = conectar(base_de_datos, database=nombre)
+    conexion.autocommit = True
+    try:
+        aplicar(conexion, ESQUEMA_ANTERIOR)
+        yield conexion
+    finally:
+        conexion.close()
+        with mantenimiento.cursor() as cursor:
+            cursor.execute(f'DROP DATABASE IF EXISTS "{nombre}" WITH (FORCE)')
+        mantenimiento.close()
+
+
+def test_migraciones_igualan_init_sql(base_de_datos, migrada):
+    assert len(MIGRACIONES) == 6
+    for ruta in MIGRACIONES:
+        aplicar(migrada, ruta)
+    with migrada.cursor() as cursor:
+        cursor.execute('SELECT SUM(total), SUM(solicitudes) FROM consumo_diario')
+        cargado = cursor.fetchone()
+        cursor.execute('SELECT SUM(cantidad), COUNT(*) FROM solicitudes')
+        # La carga inicial de 003 resume el historial de solicitudes
+        assert cargado == cursor.fetchone() != (None, 0)
+    # Volver a aplicarlas no falla ni duplica nada
+    antes = esquema(migrada)
+    for ruta in MIGRACIONES:
+        aplicar(migrada, ruta)
+    assert esquema(migrada) == antes
+    with migrada.cursor() as cursor:
+        cursor.execute('SELECT SUM(total) FROM consumo_diario')
+        assert cursor.fetchone() == (cargado[0],)
+
+    nueva = conectar(base_de_datos)
+    try:
+        esperado = esquema(nueva)
+    finally:
+        nueva.close()
+    for consulta, filas in esperado.items():
+        assert filas and antes[consulta] == filas
+
+
+def test_migracion_005_fuera_de_transaccion(migrada):
+    """005 crea y borra índices con CONCURRENTLY: no puede ir dentro de una transacción."""
+    for ruta in MIGRACIONES[:4]:
+        aplicar(migrada, ruta)
+    with migrada.cursor() as cursor:
+        migrada.autocommit = False
+        with pytest.raises(psycopg2.errors.ActiveSqlTransaction):
+            cursor.execute(open(MIGRACIONES[4], encoding='utf-8').read())
+        migrada.rollback()
+        migrada.autocommit = True
+    aplicar(migrada, MIGRACIONES[4])
+    with migrada.cursor() as cursor:
+        cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename IN ('usuarios', 'entregas') ORDER BY 1")
+        indices = [fila[0] for fila in cursor.fetchall()]
+        cursor.execute("SELECT count(*) FROM pg_index WHERE NOT indisvalid")
+        assert cursor.fetchone() == (0,)
+    assert 'idx_usuarios_username_lower' in indices and 'idx_usuarios_username' not in indices
+    assert 'idx_entregas_alumno_tarea' in indices and 'idx_entregas_alumno' not in indices
@@ -0,0 +1,75 @@
+"""bench/planes.py contra una base con datos: los índices de las consultas frecuentes se usan y
+el revisor detecta cuando falta uno."""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'bench'))
+
+import planes  # noqa: E402
+
+
+@pytest.fixture
+def poblada(datos):
+    """5000 usuarios, 200 tareas y 20000 entregas, con estadísticas al día."""
+    datos.sql("INSERT INTO usuarios (username, nombre, apellido, email, hash_contraseña, rol) "
+              "SELECT 'Alumno' || n, 'Nombre', 'Apellido', 'alumno' || n || '@sigel.test', '-', "
+              "CASE WHEN n <= 20 THEN 'docente' ELSE 'alumno' END FROM generate_series(1, 5000) n")
+    datos.sql("INSERT INTO tareas (titulo, fecha_entrega, creado_por) "
+              "SELECT 'Práctica ' || n, DATE '2030-01-01' + n, 1 + n % 20 FROM generate_series(1, 200) n")
+    datos.sql("INSERT INTO entregas (id_tarea, id_alumno, fecha_entrega) "
+              "SELECT 1 + n % 200, 21 + n % 4980, TIMESTAMP '2029-12-01' + n * INTERVAL '1 minute' "
+              "FROM generate_series(1, 20000) n")
+    datos.sql('ANALYZE usuarios; ANALYZE tareas; ANALYZE entregas')
+    return datos
+
+
+def problemas_de(app, ruta):
+    resultados, problemas = planes.revisar(app, planes.argumentos().parse_args(['--filas-minimas', '1000']))
+    claves = [clave for clave in resultados if clave.split(' #')[0] == ruta]
+    assert claves, f'{ruta} no ejecutó consultas'
+    return [problema for clave in claves for problema in problemas.get(clave, [])]
+
+
+def test_login_y_entregas_por_alumno_usan_indice(app, poblada):
+    assert problemas_de(app, 'POST /login') == []
+    assert problemas_de(app, 'GET /entregas/?id_alumno={id_alumno}') == []
+    assert problemas_de(app, 'GET /tareas/?user_id={id_alumno}&limit=20') == []
+
+
+def test_revisor_senala_indice_faltante(app, poblada):
+    poblada.sql('DROP INDEX idx_usuarios_username_lower')
+    try:
+        encontrados = problemas_de(app, 'POST /login')
+    finally:
+        poblada.sql('CREATE INDEX idx_usuarios_username_lower ON usuarios(lower(username))')
+    assert len(encontrados) == 1
+    assert encontrados[0].startswith('Seq Scan en usuarios devuelve 1 de 5000 filas')
+    assert 'CREATE INDEX ON usuarios (lower(username))' in encontrados[0]
+
+
+def test_revisor_ejecuta_todas_las_rutas(app, poblada):
+    """Ninguna ruta falla ni queda sin revisar por falta de permisos."""
+    _, problemas = planes.revisar(app, planes.argumentos().parse_args(['--filas-minimas', '1000']))
+    assert [problema for encontrados in problemas.values() for problema in encontrados if 'respondió' in problema] == []
+
+
+def test_guardar_y_comparar_linea_base(app, poblada, tmp_path, capsys):
+    linea_base = str(tmp_path / 'planes.json')
+    argumentos = ['--filas-minimas', '1000', '--guardar', linea_base]
+    try:
+        planes.main(planes.argumentos().parse_args(argumentos), app)
+    except SystemExit:
+        pass  # con problemas de plan también se guarda
+    with open(linea_base, encoding='utf-8') as archivo:
+        guardada = json.load(archivo)
+    assert guardada['filas']['entregas'] == 20000
+    assert guardada['consultas']
+    # Contra sí misma no hay regresiones
+    try:
+        planes.main(planes.argumentos().parse_args(['--filas-minimas', '1000', '--comparar', linea_base]), app)
+    except SystemExit:
+        pass
+    assert 'REGRESIÓN' not in capsys.readouterr().out
@@ -0,0 +1,41 @@
+"""Réplicas de lectura: quien acaba de escribir lee de la primaria aunque no envíe cookies."""
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+
+
+@pytest.fixture
+def con_replica(configuracion):
+    # La misma base hace de réplica sin retraso; CACHE_MAXIMO chico para que el LRU desaloje
+    configuracion.update(DATABASE_REPLICAS=[configuracion['SQLALCHEMY_DATABASE_URI']], CACHE_MAXIMO=2)
+    aplicacion = create_app(configuracion)
+    lecturas = []
+    with aplicacion.app_context():
+        motor = db.engines['replica0']
+    event.listen(motor, 'before_cursor_execute', lambda *args: lecturas.append(args[2]))
+    yield aplicacion, lecturas
+    with aplicacion.app_context():
+        for motor in db.engines.values():
+            motor.dispose()
+
+
+def test_escritura_fija_la_primaria_sin_cookies(con_replica, datos):
+    aplicacion, lecturas = con_replica
+    cliente = aplicacion.test_client(use_cookies=False)
+    docente = datos.usuario('docente')
+    otro = datos.usuario('docente')
+    cabeceras = datos.cabeceras(docente, 'docente')
+
+    assert cliente.post('/avisos/', headers=cabeceras, json={'titulo': 'Aviso', 'texto': 'Texto'}).status_code == 201
+    # Respuestas de otros catálogos llenan la caché y desalojan entradas viejas
+    for ruta in ('/categorias/', '/reactivos/', '/avisos/?page=1', '/avisos/?page=2'):
+        assert cliente.get(ruta, headers=datos.cabeceras(otro, 'docente')).status_code == 200
+    del lecturas[:]
+
+    avisos = cliente.get('/avisos/?page=3', headers=cabeceras)
+    assert avisos.status_code == 200
+    assert lecturas == []
+    # Los demás usuarios siguen leyendo de la réplica
+    assert cliente.get('/avisos/?page=4', headers=datos.cabeceras(otro, 'docente')).status_code == 200
+    assert lecturas
@@ -0,0 +1,70 @@
+"""Movimientos de stock concurrentes: el UPDATE condicional no deja existencias negativas."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from app import Categoria, Reactivo
+
+
+def reactivo(datos, cantidad, minimo=0):
+    docente = datos.usuario('docente')
+    categoria = datos.crear(Categoria, nombre='Ácidos')
+    return docente, datos.crear(Reactivo, nombre='Ácido acético', cantidad=cantidad, unidad='mL', minimo=minimo,
+                                ubicacion='A1', id_categoria=categoria, creado_por=docente)
+
+
+def a_la_vez(peticiones, funcion):
+    """Ejecuta ``funcion`` en ``peticiones`` hilos que arrancan juntos; devuelve los códigos."""
+    salida = threading.Barrier(peticiones)
+
+    def ejecutar(numero):
+        salida.wait()
+        return funcion(numero)
+    with ThreadPoolExecutor(max_workers=peticiones) as ejecutor:
+        return list(ejecutor.map(ejecutar, range(peticiones)))
+
+
+def test_solicitudes_concurrentes_no_dejan_stock_negativo(cliente, datos):
+    _, id_reactivo = reactivo(datos, 10)
+    alumnos = [datos.usuario('alumno') for _ in range(30)]
+
+    def solicitar(numero):
+        return cliente.post('/solicitudes/', json={
+            'id_reactivo': id_reactivo, 'cantidad': 1, 'proyecto': 'Práctica', 'es_proyecto': False,
+            'id_usuario': alumnos[numero]}).status_code
+    codigos = a_la_vez(30, solicitar)
+
+    assert codigos.count(201) == 10
+    assert codigos.count(400) == 20
+    assert datos.sql('SELECT cantidad FROM reactivos WHERE id_reactivo = :id', id=id_reactivo)[0][0] == 0
+    assert datos.sql('SELECT COUNT(*), SUM(cantidad) FROM solicitudes')[0] == (10, Decimal(10))
+    # El acumulado de consumo coincide con las solicitudes guardadas
+    assert datos.sql('SELECT SUM(total), SUM(solicitudes) FROM consumo_diario')[0] == (Decimal(10), 10)
+
+
+def test_bajas_concurrentes_reponen_una_sola_vez(cliente, datos):
+    _, id_reactivo = reactivo(datos, 5)
+    alumno = datos.usuario('alumno')
+    respuesta = cliente.post('/solicitudes/', json={'id_reactivo': id_reactivo, 'cantidad': 3, 'proyecto': 'Tesis',
+                                                     'es_proyecto': True, 'id_usuario': alumno})
+    id_solicitud = respuesta.get_json()['id_solicitud']
+
+    codigos = a_la_vez(10, lambda numero: cliente.delete(f'/solicitudes/{id_solicitud}').status_code)
+
+    assert sorted(codigos) == [200] + [404] * 9
+    assert datos.sql('SELECT cantidad FROM reactivos WHERE id_reactivo = :id', id=id_reactivo)[0][0] == 5
+    assert datos.sql('SELECT COALESCE(SUM(solicitudes), 0) FROM consumo_diario')[0][0] == 0
+
+
+def test_cruce_del_minimo_avisa_una_vez(cliente, datos):
+    docente, id_reactivo = reactivo(datos, 10, minimo=4)
+    alumnos = [datos.usuario('alumno') for _ in range(10)]
+
+    def solicitar(numero):
+        return cliente.post('/solicitudes/', json={
+            'id_reactivo': id_reactivo, 'cantidad': 1, 'proyecto': 'Práctica', 'es_proyecto': False,
+            'id_usuario': alumnos[numero]}).status_code
+    assert a_la_vez(10, solicitar).count(201) == 10
+
+    avisos = datos.sql('SELECT id_usuario, titulo FROM avisos')
+    assert avisos == [(docente, 'Stock bajo: Ácido acético')]
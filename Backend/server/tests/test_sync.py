@@ -0,0 +1,62 @@
+"""GET /sync: el token avanza en orden de confirmación y no salta cambios de transacciones lentas."""
+from conftest import conectar
+
+
+def sincronizar(cliente, cabeceras, token, **parametros):
+    respuesta = cliente.get('/sync', headers=cabeceras, query_string=dict(parametros, since=token))
+    assert respuesta.status_code == 200, respuesta.get_data(as_text=True)
+    return respuesta.get_json()
+
+
+def test_transaccion_lenta_no_queda_detras_del_token(app, cliente, datos):
+    docente = datos.usuario('docente')
+    cabeceras = datos.cabeceras(docente, 'docente')
+    token = cliente.get('/sync', headers=cabeceras).get_json()['token']
+
+    # Una transacción abierta registra su cambio con un id de cambios menor...
+    lenta = conectar(app.config['SQLALCHEMY_DATABASE_URI'])
+    try:
+        with lenta.cursor() as cursor:
+            cursor.execute("INSERT INTO avisos (id_usuario, titulo, texto) VALUES (%s, 'Lento', 'Texto') "
+                           "RETURNING id_aviso", (docente,))
+            id_lento = cursor.fetchone()[0]
+            cursor.execute("INSERT INTO cambios (recurso, id_registro, operacion) VALUES ('avisos', %s, 'U')",
+                           (id_lento,))
+        # ...y otra confirma después con un id mayor
+        rapido = cliente.post('/avisos/', headers=cabeceras, json={'titulo': 'Rápido', 'texto': 'Texto'})
+        id_rapido = rapido.get_json()['id_aviso']
+
+        pendiente = sincronizar(cliente, cabeceras, token)
+        # Ninguno se entrega mientras la transacción lenta siga abierta
+        assert pendiente['cambios'] == {}
+        token = pendiente['token']
+        lenta.commit()
+    finally:
+        lenta.close()
+
+    confirmados = sincronizar(cliente, cabeceras, token)
+    assert sorted(aviso['id_aviso'] for aviso in confirmados['cambios']['avisos']) == [id_lento, id_rapido]
+    assert sincronizar(cliente, cabeceras, confirmados['token'])['cambios'] == {}
+
+
+def test_paginas_y_bajas(cliente, datos):
+    docente = datos.usuario('docente')
+    cabeceras = datos.cabeceras(docente, 'docente')
+    avisos = [cliente.post('/avisos/', headers=cabeceras, json={'titulo': f'Aviso {numero}', 'texto': 'Texto'})
+              .get_json()['id_aviso'] for numero in range(5)]
+    assert cliente.delete(f'/avisos/{avisos[0]}', headers=cabeceras).status_code == 200
+
+    recibidos, eliminados, token, paginas = [], [], '0', 0
+    while True:
+        pagina = sincronizar(cliente, cabeceras, token, recursos='avisos', limit=2)
+        recibidos += [aviso['id_aviso'] for aviso in pagina['cambios'].get('avisos', [])]
+        eliminados += pagina['eliminados'].get('avisos', [])
+        token, paginas = pagina['token'], paginas + 1
+        if not pagina['hay_mas']:
+            break
+    # 5 altas y 1 baja de a 2 cambios por página; la última confirma que no hay más
+    assert paginas == 4
+    assert sorted(recibidos) == avisos[1:]
+    # El aviso borrado llega como baja, también en la página de su alta
+    assert set(eliminados) == {avisos[0]}
+    assert cliente.get('/sync?since=ayer', headers=cabeceras).status_code == 400
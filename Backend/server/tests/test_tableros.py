@@ -0,0 +1,91 @@
+"""Estado de tareas por alumno y tableros de alumno y docente, calculados en SQL."""
+from datetime import date, datetime, time, timedelta
+
+from app import Entrega, Tarea
+
+AYER = date.today() - timedelta(days=1)
+MAÑANA = date.today() + timedelta(days=1)
+
+
+def poblar(datos):
+    """Tareas del docente con cada estado posible para ``alumno``."""
+    docente = datos.usuario('docente')
+    alumno, otro = datos.usuario('alumno'), datos.usuario('alumno')
+    tareas = {
+        'completed': datos.crear(Tarea, titulo='A tiempo', fecha_entrega=AYER, hora_cierre=time(18), creado_por=docente),
+        'late': datos.crear(Tarea, titulo='Tarde', fecha_entrega=AYER, hora_cierre=time(18), creado_por=docente),
+        'overdue': datos.crear(Tarea, titulo='Vencida', fecha_entrega=AYER, creado_por=docente),
+        'pending': datos.crear(Tarea, titulo='Abierta', fecha_entrega=MAÑANA, creado_por=docente),
+        'pending_sin_hora': datos.crear(Tarea, titulo='Abierta hoy', fecha_entrega=date.today(), creado_por=docente),
+    }
+    datos.crear(Entrega, id_tarea=tareas['completed'], id_alumno=alumno, fecha_entrega=datetime.combine(AYER, time(17)),
+                calificacion=9)
+    # La primera entrega decide el estado aunque después vuelva a entregar
+    datos.crear(Entrega, id_tarea=tareas['late'], id_alumno=alumno, fecha_entrega=datetime.combine(AYER, time(19)))
+    datos.crear(Entrega, id_tarea=tareas['late'], id_alumno=alumno, fecha_entrega=datetime.combine(AYER, time(20)))
+    datos.crear(Entrega, id_tarea=tareas['completed'], id_alumno=otro, fecha_entrega=datetime.combine(AYER, time(10)))
+    return docente, alumno, otro, tareas
+
+
+def test_estado_de_cada_tarea_para_el_alumno(cliente, datos, sentencias):
+    docente, alumno, _, tareas = poblar(datos)
+    cabeceras = datos.cabeceras(alumno, 'alumno')
+    with sentencias() as ejecutadas:
+        respuesta = cliente.get(f'/tareas/?user_id={alumno}', headers=cabeceras)
+    assert respuesta.status_code == 200
+    estados = {tarea['id']: tarea['status'] for tarea in respuesta.get_json()}
+    assert estados == {tareas['completed']: 'completed', tareas['late']: 'late', tareas['overdue']: 'overdue',
+                       tareas['pending']: 'pending', tareas['pending_sin_hora']: 'pending'}
+    assert len(ejecutadas) == 1
+    # Sin user_id no hay estado
+    sin_alumno = cliente.get('/tareas/', headers=datos.cabeceras(docente, 'docente')).get_json()
+    assert {tarea['status'] for tarea in sin_alumno} == {None}
+
+
+def test_tablero_del_alumno(cliente, datos):
+    _, alumno, otro, tareas = poblar(datos)
+    cabeceras = datos.cabeceras(alumno, 'alumno')
+    tablero = cliente.get(f'/tareas/tablero/alumno/{alumno}?proximas=1', headers=cabeceras).get_json()
+    assert tablero['total'] == 5
+    assert tablero['conteos'] == {'pending': 2, 'completed': 1, 'late': 1, 'overdue': 1}
+    # La que cierra antes (hoy al final del día) va primero
+    assert [(tarea['id'], tarea['status']) for tarea in tablero['proximas']] == [
+        (tareas['pending_sin_hora'], 'pending')]
+
+    del_otro = cliente.get(f'/tareas/tablero/alumno/{otro}', headers=datos.cabeceras(otro, 'alumno')).get_json()
+    assert del_otro['conteos'] == {'pending': 2, 'completed': 1, 'late': 0, 'overdue': 2}
+    assert cliente.get(f'/tareas/tablero/alumno/{otro}', headers=cabeceras).status_code == 403
+
+
+def test_tablero_del_docente(cliente, datos):
+    docente, _, otro, tareas = poblar(datos)
+    datos.usuario('alumno')  # un tercer alumno sin entregas
+    # Entregó a tiempo y volvió a entregar después del cierre: no cuenta como tarde
+    datos.crear(Entrega, id_tarea=tareas['completed'], id_alumno=otro, fecha_entrega=datetime.combine(AYER, time(21)))
+    tablero = cliente.get(f'/tareas/tablero/docente/{docente}',
+                          headers=datos.cabeceras(docente, 'docente')).get_json()
+    assert tablero['alumnos'] == 3
+    por_tarea = {tarea['id']: tarea for tarea in tablero['tareas']}
+    assert len(por_tarea) == 5
+    completada = por_tarea[tareas['completed']]
+    assert (completada['entregados'], completada['calificadas'], completada['pendientes']) == (2, 1, 1)
+    assert completada['tasa_entrega'] == round(2 / 3, 4)
+    # Dos entregas del mismo alumno cuentan como un entregado
+    assert por_tarea[tareas['late']]['entregados'] == 1
+    assert por_tarea[tareas['pending']]['pendientes'] == 3
+    # Tarde según el cierre de la propia tarea y la primera entrega de cada alumno
+    assert {nombre: por_tarea[id_tarea]['tarde'] for nombre, id_tarea in tareas.items()} == {
+        'completed': 0, 'late': 1, 'overdue': 0, 'pending': 0, 'pending_sin_hora': 0}
+    # Ordenadas por fecha de entrega descendente
+    assert [tarea['id'] for tarea in tablero['tareas']][:2] == [tareas['pending'], tareas['pending_sin_hora']]
+
+
+def test_tablero_del_docente_solo_para_el_personal(cliente, datos):
+    docente, alumno, _, _ = poblar(datos)
+    otro_docente = datos.usuario('docente')
+    admin = datos.usuario('admin')
+    ruta = f'/tareas/tablero/docente/{docente}'
+    assert cliente.get(ruta).status_code == 401
+    assert cliente.get(ruta, headers=datos.cabeceras(alumno, 'alumno')).status_code == 403
+    assert cliente.get(ruta, headers=datos.cabeceras(otro_docente, 'docente')).status_code == 403
+    assert cliente.get(ruta, headers=datos.cabeceras(admin, 'admin')).status_code == 200